@@ -1,78 +1,37 @@
 # btc_wallet_app/cli/commands.py
 import click
+import functools
 import os
+import pathlib
+import sys
 from getpass import getpass # For securely getting passwords
 
-# Adjust imports based on actual project structure and how config is accessed
-try:
-    # This assumes 'btc_wallet_app' is the top-level package in PYTHONPATH
-    from btc_wallet_app.wallet import key_manager, utxo_manager, tx_builder, tx_signer, broadcaster
-    from btc_wallet_app import config as wallet_config
-except ImportError:
-    # Fallback for scenarios where 'btc_wallet_app' is not directly in PYTHONPATH
-    # This might happen if running commands.py directly or if Python path is not set up for the package.
-    # For robust execution, ensure btc_wallet_app's parent directory is in sys.path
-    # or install btc_wallet_app as a package.
-    import sys
-    current_script_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root_assumed = os.path.dirname(os.path.dirname(current_script_dir)) # up two levels from cli/commands.py to btc_wallet_app_root
-
-    # Attempt to add project root to sys.path if not already there
-    # This is a common pattern but might need adjustment based on actual execution context
-    # This should point to the directory CONTAINING 'btc_wallet_app' if 'btc_wallet_app' is the package name.
-    # Or, if 'btc_wallet_app' is the root and we do 'from wallet import ...', then project_root_assumed is correct.
-    # The provided import `from btc_wallet_app.wallet import ...` suggests `project_root_assumed`'s PARENT should be in path,
-    # or `project_root_assumed` itself IS the `btc_wallet_app` directory. Let's try adding `project_root_assumed`
-    # which would make sense if we are doing `from wallet import ...`
-
-    # If the top-level package is btc_wallet_app, then project_root_assumed (parent of btc_wallet_app) needs to be in path.
-    # For imports like `from btc_wallet_app.wallet import ...`
-    # Let's adjust path for this case:
-    parent_of_project_root_assumed = os.path.dirname(project_root_assumed)
-    if parent_of_project_root_assumed not in sys.path:
-        sys.path.insert(0, parent_of_project_root_assumed)
-
-    # If the structure is such that 'btc_wallet_app' is the root of the modules being imported
-    # (e.g. `import config`, `from wallet import key_manager`), then add `project_root_assumed` to path.
-    # The original code had `from btc_wallet_app.wallet import ...`, so the above (parent_of_project_root_assumed) is more likely.
-    # Let's stick to the original logic for now and see if it works.
-    # The prompt's original fallback was:
-    # module_src_path = os.path.join(project_root_assumed)
-    # if module_src_path not in sys.path:
-    #      sys.path.insert(0, module_src_path)
-    # from wallet import key_manager, utxo_manager, tx_builder, tx_signer, broadcaster
-    # import config as wallet_config
-    # This implies project_root_assumed IS the btc_wallet_app directory.
-
-    # Sticking to the prompt's original fallback structure for imports:
-    if project_root_assumed not in sys.path: # project_root_assumed is .../btc_wallet_app
-         sys.path.insert(0, project_root_assumed)
-
-    from wallet import key_manager, utxo_manager, tx_builder, tx_signer, broadcaster
-    import config as wallet_config
-
-
-# Default wallet file path from config
-DEFAULT_WALLET_FILENAME = wallet_config.WALLET_FILE
-default_wallet_path = os.path.join(wallet_config.BASE_DIR, DEFAULT_WALLET_FILENAME)
-
-if wallet_config.BASE_DIR == ".":
-    # If BASE_DIR is relative '.', make it relative to the assumed project root (btc_wallet_app/)
-    # This is where main.py would be executed from.
-    _project_root_for_wallet = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    default_wallet_path = os.path.join(_project_root_for_wallet, DEFAULT_WALLET_FILENAME)
-    # However, if BASE_DIR is '.', it's usually current working directory.
-    # Let's refine: if BASE_DIR is '.', default_wallet_path will be ./wallet.dat (in CWD)
-    # This is generally fine. The user can override with --walletfile.
-    # The config.py sets BASE_DIR = "."
-    # If running `python btc_wallet_app/main.py` from outside `btc_wallet_app`, CWD is outside.
-    # If running `python main.py` from inside `btc_wallet_app`, CWD is `btc_wallet_app`.
-    # A common expectation for BASE_DIR="." is that paths are relative to where the main script is invoked.
-    # For Click, it's often better to use `click.get_app_dir()` for user-specific config/data.
-    # For now, let's keep it simple: if BASE_DIR is '.', it's relative to CWD.
-    # The definition in the prompt for default_wallet_path using _project_root_for_wallet is specific.
-    # Let's adhere to the prompt's logic for default_wallet_path.
-    pass # The prompt's logic for default_wallet_path is kept for now.
+# Resolve the package root exactly once and make sure it is importable. This replaces
+# the old nested try/except fallback that re-derived paths and mutated sys.path on
+# every import; for installed usage (pip install -e . / python -m btc_wallet_app)
+# the insert is a no-op.
+_PKG_ROOT = pathlib.Path(__file__).resolve().parents[2]
+if str(_PKG_ROOT) not in sys.path:
+    sys.path.insert(0, str(_PKG_ROOT))
+
+from btc_wallet_app import config as wallet_config
+from btc_wallet_app import paths
+
+# Only config is imported eagerly; the wallet modules (key_manager etc.) pull in the
+# whole crypto stack and are deferred to the subcommands that actually need them,
+# so `--help` and cheap commands dispatch without paying that import cost.
+
+
+@functools.lru_cache(maxsize=1)
+def _load_key_manager():
+    """Imports key_manager on first real use (it drags in bitcoinlib + cryptography)."""
+    from btc_wallet_app.wallet import key_manager
+    return key_manager
+
+
+# Default wallet file path, resolved lazily (and only once) on first real use.
+# Path policy (BASE_DIR handling, app-dir default) is centralized in paths.py.
+_get_default_wallet_path = paths.wallet_file
 
 
 @click.group()
@@ -80,10 +39,11 @@ if wallet_config.BASE_DIR == ".":
 def cli(ctx):
     """A simple Bitcoin wallet CLI. Manage keys and transactions."""
     ctx.ensure_object(dict)
-    # Example: ctx.obj['NETWORK'] = wallet_config.NETWORK
-    # This makes wallet_config accessible in subcommands via ctx.obj['WALLET_CONFIG']
+    # This makes wallet_config accessible in subcommands via ctx.obj['WALLET_CONFIG'].
+    # Store the callable, not the resolved path, so the path is only computed when a
+    # subcommand actually needs it (i.e. no --walletfile override was given).
     ctx.obj['WALLET_CONFIG'] = wallet_config
-    ctx.obj['DEFAULT_WALLET_PATH'] = default_wallet_path # Pass calculated default
+    ctx.obj['DEFAULT_WALLET_PATH_FN'] = _get_default_wallet_path
 
 
 @cli.command()
@@ -99,7 +59,7 @@ def generatekey(ctx, network, addrtype, walletfile, save):
     """Generates a new Bitcoin private key (WIF) and address."""
 
     cfg = ctx.obj['WALLET_CONFIG']
-    actual_wallet_path = walletfile if walletfile else ctx.obj['DEFAULT_WALLET_PATH']
+    actual_wallet_path = walletfile if walletfile else str(ctx.obj['DEFAULT_WALLET_PATH_FN']())
 
     effective_network = network if network else cfg.NETWORK
 
@@ -111,6 +71,8 @@ def generatekey(ctx, network, addrtype, walletfile, save):
         click.secho(f"Error: Invalid network '{effective_network}'. Choose mainnet, testnet, or regtest.", fg="red")
         return
 
+    key_manager = _load_key_manager()
+
     try:
         key_data = key_manager.generate_wif_key(network_name=km_network_name, address_type=addrtype)
 
@@ -130,12 +92,6 @@ def generatekey(ctx, network, addrtype, walletfile, save):
                     click.secho(f"Error creating directory {wallet_dir}: {e}", fg="red")
                     return
 
-            if os.path.exists(actual_wallet_path):
-                click.secho(f"Warning: Wallet file '{actual_wallet_path}' already exists.", fg="yellow")
-                if not click.confirm("Overwrite existing wallet file with this new key? (This is destructive if it contains other keys)"):
-                    click.echo("Aborted saving key.")
-                    return
-
             password = getpass("Enter password to encrypt key file: ")
             password_confirm = getpass("Confirm password: ")
             if password != password_confirm:
@@ -143,8 +99,21 @@ def generatekey(ctx, network, addrtype, walletfile, save):
                 return
 
             try:
-                key_manager.save_encrypted_key(key_data, password, actual_wallet_path)
+                # Append-only: existing keys in the file are never re-encrypted,
+                # so there is nothing to overwrite and no confirmation needed.
+                key_manager.append_encrypted_key(key_data, password, actual_wallet_path)
                 click.secho(f"Key securely saved to {actual_wallet_path}", fg="green")
+
+                # Mirror the public metadata into the SQLite keys table so hot
+                # lookups (balance, labels) never touch the encrypted file.
+                from btc_wallet_app.storage import database
+                database.initialize_db()
+                database.add_key_record(
+                    address=key_data['address'],
+                    network=effective_network,
+                    address_type=addrtype,
+                    wif_filename=os.path.basename(actual_wallet_path)
+                )
             except Exception as e:
                 click.secho(f"Error saving key: {e}", fg="red")
 
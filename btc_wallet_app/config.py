@@ -1,27 +1,54 @@
 # btc_wallet_app/config.py
+from dataclasses import dataclass
+from typing import Final
 
 # Bitcoin Core RPC settings
-RPC_USER = "your_rpc_user"
-RPC_PASSWORD = "your_rpc_password"
-RPC_HOST = "127.0.0.1"  # Or your Bitcoin Core host
-RPC_PORT = 8332  # Mainnet RPC port (18332 for Testnet)
-RPC_URL = f"http://{RPC_USER}:{RPC_PASSWORD}@{RPC_HOST}:{RPC_PORT}"
+RPC_USER: Final = "your_rpc_user"
+RPC_PASSWORD: Final = "your_rpc_password"
+RPC_HOST: Final = "127.0.0.1"  # Or your Bitcoin Core host
+RPC_PORT: Final = 8332  # Mainnet RPC port (18332 for Testnet)
+RPC_URL: Final = f"http://{RPC_USER}:{RPC_PASSWORD}@{RPC_HOST}:{RPC_PORT}"
 
 # Wallet settings
-WALLET_FILE = "wallet.dat"  # Encrypted wallet file
-LOG_FILE = "wallet.log"
-MIN_CONFIRMATIONS = 1  # Minimum confirmations for UTXOs
+# Split storage: spending material lives in KEYS_FILE (encrypted, rarely written,
+# appended one blob per key), while hot metadata (addresses, labels, tx history)
+# lives unencrypted in the SQLite database under storage/.
+WALLET_FILE: Final = "wallet.dat"  # Legacy single-file encrypted wallet
+KEYS_FILE: Final = "wallet.keys"  # Encrypted key material (append-only)
+LOG_FILE: Final = "wallet.log"
+MIN_CONFIRMATIONS: Final = 1  # Minimum confirmations for UTXOs
 
 # Fee policy
-DEFAULT_FEE_SATS_PER_BYTE = 10  # Default fee rate in satoshis per byte
+DEFAULT_FEE_SATS_PER_BYTE: Final = 10  # Default fee rate in satoshis per byte
 
 # Network (mainnet or testnet)
-NETWORK = "mainnet"  # Options: "mainnet", "testnet"
+NETWORK: Final = "mainnet"  # Options: "mainnet", "testnet"
 
 # Paths
-BASE_DIR = "." # Or specify an absolute path
+BASE_DIR: Final = "." # Or specify an absolute path
 
-# Add __init__.py to make sure the files are importable
-# already done in previous step.
 
-# You can add more configuration options as needed
+@dataclass(frozen=True, slots=True)
+class Config:
+    """
+    Immutable snapshot of the settings above, with RPC_URL pre-built.
+    Attribute reads on the slotted instance are C-level slot loads rather than
+    module-namespace dict lookups, which matters in hot loops (e.g. reading
+    MIN_CONFIRMATIONS per UTXO). Code on hot paths should prefer CONFIG;
+    the module-level constants remain for existing callers.
+    """
+    RPC_USER: str = RPC_USER
+    RPC_PASSWORD: str = RPC_PASSWORD
+    RPC_HOST: str = RPC_HOST
+    RPC_PORT: int = RPC_PORT
+    RPC_URL: str = RPC_URL
+    WALLET_FILE: str = WALLET_FILE
+    KEYS_FILE: str = KEYS_FILE
+    LOG_FILE: str = LOG_FILE
+    MIN_CONFIRMATIONS: int = MIN_CONFIRMATIONS
+    DEFAULT_FEE_SATS_PER_BYTE: int = DEFAULT_FEE_SATS_PER_BYTE
+    NETWORK: str = NETWORK
+    BASE_DIR: str = BASE_DIR
+
+
+CONFIG = Config()
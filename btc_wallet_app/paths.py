@@ -0,0 +1,74 @@
+# btc_wallet_app/paths.py
+"""
+Central resolution of where the wallet's data lives on disk.
+
+commands.py and database.py used to duplicate the BASE_DIR == "." fallback logic,
+each re-running os.path.abspath(__file__) walks at import time. All path decisions
+now live here, computed once and cached. When BASE_DIR is the default ".", data
+goes to the platform-appropriate per-user app directory (click.get_app_dir), so
+results no longer depend on the current working directory.
+"""
+import functools
+import pathlib
+
+import click
+
+from btc_wallet_app import config as wallet_config
+
+
+@functools.cache
+def base_dir() -> pathlib.Path:
+    """Root directory for wallet data. Cached after the first call."""
+    if wallet_config.BASE_DIR == ".":
+        return pathlib.Path(click.get_app_dir("mybtc"))
+    return pathlib.Path(wallet_config.BASE_DIR)
+
+
+@functools.cache
+def wallet_file() -> pathlib.Path:
+    """Path of the append-only encrypted key material file (wallet.keys).
+
+    Before the app-dir default, BASE_DIR "." resolved to the package directory,
+    so wallets may already exist there (as wallet.keys, or as a legacy
+    single-blob wallet.dat). If the new default does not exist yet but such a
+    file does, keep using it — moving the default must not orphan key material.
+    """
+    path = base_dir() / wallet_config.KEYS_FILE
+    if not path.exists():
+        legacy_dir = pathlib.Path(__file__).resolve().parent
+        for legacy_name in (wallet_config.KEYS_FILE, wallet_config.WALLET_FILE):
+            legacy = legacy_dir / legacy_name
+            if legacy.exists():
+                return legacy
+    return path
+
+
+@functools.cache
+def db_file() -> pathlib.Path:
+    """Path of the SQLite metadata database. config.DB_PATH overrides if set.
+
+    Same legacy fallback as wallet_file(): before the app-dir default the
+    database lived under the package directory, and an existing one there
+    holds the key labels and transaction history (and possibly the old
+    amount_btc schema, which database.py migrates on open). Creating a fresh
+    empty DB in the app dir would orphan all of that, so a pre-existing
+    legacy database keeps winning until an app-dir one exists.
+    """
+    db_path_override = getattr(wallet_config, 'DB_PATH', None)
+    if db_path_override:
+        return pathlib.Path(db_path_override)
+    path = base_dir() / "storage" / "db.sqlite"
+    if not path.exists():
+        legacy = pathlib.Path(__file__).resolve().parent / "storage" / "db.sqlite"
+        if legacy.exists():
+            return legacy
+    return path
+
+
+@functools.cache
+def log_file() -> pathlib.Path:
+    """Path of the application log file."""
+    log_path = pathlib.Path(wallet_config.LOG_FILE)
+    if log_path.is_absolute():
+        return log_path
+    return base_dir() / log_path
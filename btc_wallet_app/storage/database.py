@@ -1,243 +1,319 @@
 # btc_wallet_app/storage/database.py
 import sqlite3
 import os
-from decimal import Decimal
+import pathlib
+import threading
 from datetime import datetime
-import sys # For path and error printing
-import logging # Added for fallback logger
+import sys # For path resolution
 
-try:
-    # Assuming 'btc_wallet_app' is in PYTHONPATH
-    from btc_wallet_app import config as wallet_config
-    from btc_wallet_app.utils.logger import get_logger
-except ImportError:
-    # Fallback for direct execution or if 'btc_wallet_app' is not directly discoverable
-    current_script_dir = os.path.dirname(os.path.abspath(__file__)) # .../storage
-    project_root_assumed = os.path.dirname(current_script_dir) # .../btc_wallet_app
+# Resolve the package root once and make sure it is importable; replaces the old
+# nested try/except fallback that re-derived paths and mutated sys.path repeatedly.
+_PKG_ROOT = str(pathlib.Path(__file__).resolve().parents[2])
+if _PKG_ROOT not in sys.path:
+    sys.path.insert(0, _PKG_ROOT)
 
-    if project_root_assumed not in sys.path:
-        sys.path.insert(0, project_root_assumed)
+from btc_wallet_app import config as wallet_config
+from btc_wallet_app import paths
+from btc_wallet_app.utils.logger import get_logger
 
-    try:
-        import config as wallet_config # type: ignore
-        from utils.logger import get_logger # type: ignore
-    except ImportError:
-        # If utils.logger still not found, try adding parent of project_root_assumed for btc_wallet_app.utils
-        grandparent_dir = os.path.dirname(project_root_assumed)
-        if grandparent_dir not in sys.path:
-            sys.path.insert(0, grandparent_dir)
-        try:
-            from btc_wallet_app import config as wallet_config
-            from btc_wallet_app.utils.logger import get_logger
-        except ImportError as e_imp:
-            print(f"CRITICAL: database.py could not import dependencies: {e_imp}", file=sys.stderr)
-            # Define a minimal fallback config and logger if import fails
-            class FallbackConfig:
-                BASE_DIR = "."
-            wallet_config = FallbackConfig()
-
-            # Minimal fallback logger
-            def get_logger(name="fallback_db", level=None, log_to_console=None):
-                fb_logger = logging.getLogger(name)
-                if not fb_logger.handlers: # Setup only if no handlers to avoid duplication
-                    fb_logger.setLevel(logging.INFO if level is None else level)
-                    handler = logging.StreamHandler(sys.stdout if log_to_console is None else sys.stdout if log_to_console else sys.devnull)
-                    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
-                    fb_logger.addHandler(handler)
-                return fb_logger
-
-
-DB_NAME = "db.sqlite"
-_db_path = getattr(wallet_config, 'DB_PATH', None) # Check if a specific DB_PATH is in config
-
-if not _db_path:
-    # Default path construction if DB_PATH is not in config
-    base_dir_to_use = getattr(wallet_config, 'BASE_DIR', ".")
-    if base_dir_to_use == ".":
-        # If BASE_DIR is '.', place db in btc_wallet_app/storage/
-        # Assumes this script is in btc_wallet_app/storage/database.py
-        # Project root is parent of parent of current_script_dir if current_script_dir = .../storage/database.py
-        _project_root_for_db = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        _db_path = os.path.join(_project_root_for_db, "storage", DB_NAME)
-    else:
-        # If BASE_DIR is specific, put db in BASE_DIR/storage/ (or just BASE_DIR if that's preferred)
-        # The original prompt implied db.sqlite was directly in storage/, not BASE_DIR/storage
-        # Let's assume it's meant to be in the 'storage' subdirectory of where BASE_DIR points.
-        _db_path = os.path.join(base_dir_to_use, "storage", DB_NAME)
-
-
-# Ensure _db_path is absolute
-_db_path = os.path.abspath(_db_path)
+
+# All path policy (BASE_DIR handling, DB_PATH override) lives in paths.py now.
+_db_path = str(paths.db_file())
 
 logger = get_logger(__name__)
 
+# One connection per thread, opened lazily and reused for the lifetime of the thread.
+# sqlite3.connect() plus the directory-existence probe used to run on *every* query,
+# which dominated the cost of millisecond-scale SELECTs.
+_local = threading.local()
+
+# Create the database directory at import time: it is cheap (one syscall with
+# exist_ok), idempotent, and doing it here removes the per-connection flag check
+# from get_db_connection entirely.
+_db_dir = os.path.dirname(_db_path)
+if _db_dir:
+    os.makedirs(_db_dir, exist_ok=True)
+
 def get_db_connection():
-    """Establishes a connection to the SQLite database."""
-    db_dir = os.path.dirname(_db_path)
-    if db_dir and not os.path.exists(db_dir):
-        try:
-            os.makedirs(db_dir, exist_ok=True)
-            logger.info(f"Created database directory: {db_dir}")
-        except OSError as e:
-            logger.error(f"Error creating database directory {db_dir}: {e}")
-            raise
-
-    conn = sqlite3.connect(_db_path)
+    """Returns the thread-local SQLite connection, opening it on first use."""
+    conn = getattr(_local, 'conn', None)
+    if conn is not None:
+        return conn
+
+    # Larger statement cache so all hoisted _SQL_* statements stay prepared
+    conn = sqlite3.connect(_db_path, cached_statements=256)
     conn.row_factory = sqlite3.Row
+    # WAL avoids fsync-per-commit of the default rollback journal and allows
+    # concurrent readers; the remaining pragmas trade a little durability for
+    # much cheaper commits, which is appropriate for local wallet metadata.
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-20000")
+    _local.conn = conn
     return conn
 
+def reset_db_state():
+    """
+    Closes this thread's cached connection and clears the initialized flag.
+
+    Needed whenever _db_path changes at runtime (tests point the module at a
+    temporary database): without it the thread-local connection stays bound to
+    the old file and initialize_db's module flag makes re-initialization a
+    no-op against the new path.
+    """
+    global _initialized
+    conn = getattr(_local, 'conn', None)
+    if conn is not None:
+        conn.close()
+        _local.conn = None
+    _initialized = False
+
+
+def _migrate_amount_btc_to_sats(conn):
+    """
+    One-time migration: older databases stored amounts as TEXT BTC ('amount_btc'),
+    which forced a Decimal parse on every read. Amounts now live as INTEGER
+    satoshis ('amount_sats'); conversion to BTC happens only at display time.
+    """
+    cols = [r[1] for r in conn.execute("PRAGMA table_info(transactions)")]
+    if 'amount_btc' not in cols:
+        return
+    if 'amount_sats' not in cols:
+        conn.execute("ALTER TABLE transactions ADD COLUMN amount_sats INTEGER")
+    conn.execute(
+        "UPDATE transactions SET amount_sats = CAST(ROUND(amount_btc * 100000000) AS INTEGER) "
+        "WHERE amount_sats IS NULL AND amount_btc IS NOT NULL"
+    )
+    conn.execute("ALTER TABLE transactions DROP COLUMN amount_btc")
+    logger.info("Migrated transactions.amount_btc (TEXT) to amount_sats (INTEGER).")
+
+
+# Whole schema in one script so initialize_db issues a single round-trip inside one
+# transaction. The composite indexes let filtered/sorted queries be served from an
+# index range scan instead of a full scan + sort once the tables grow.
+_SCHEMA_SQL = """
+BEGIN IMMEDIATE;
+CREATE TABLE IF NOT EXISTS keys (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    address TEXT UNIQUE NOT NULL,
+    wif_filename TEXT,
+    label TEXT,
+    network TEXT NOT NULL,
+    address_type TEXT NOT NULL,
+    creation_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    txid TEXT UNIQUE NOT NULL,
+    date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    amount_sats INTEGER,
+    fee_sats INTEGER,
+    recipient_address TEXT,
+    status TEXT,
+    notes TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_keys_net_type ON keys(network, address_type, creation_date DESC);
+CREATE INDEX IF NOT EXISTS idx_tx_date_status ON transactions(date DESC, status);
+COMMIT;
+"""
+
+_initialized = False
+
 def initialize_db():
-    """Initializes the database and creates tables if they don't exist."""
+    """Initializes the database and creates tables if they don't exist.
+
+    The schema runs as one executescript inside a single transaction, and a
+    module flag makes repeat calls within the same process free.
+    """
+    global _initialized
+    if _initialized:
+        return
     try:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-
-            cursor.execute("""
-            CREATE TABLE IF NOT EXISTS keys (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                address TEXT UNIQUE NOT NULL,
-                wif_filename TEXT,
-                label TEXT,
-                network TEXT NOT NULL,
-                address_type TEXT NOT NULL,
-                creation_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            """)
-            logger.info("Keys table initialized or already exists.")
-
-            cursor.execute("""
-            CREATE TABLE IF NOT EXISTS transactions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                txid TEXT UNIQUE NOT NULL,
-                date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                amount_btc TEXT,
-                fee_sats INTEGER,
-                recipient_address TEXT,
-                status TEXT,
-                notes TEXT
-            )
-            """)
-            logger.info("Transactions table initialized or already exists.")
-
-            conn.commit()
-        logger.info(f"Database initialized successfully at {_db_path}")
+        conn = get_db_connection()
+        conn.executescript(_SCHEMA_SQL)
+        with conn:
+            _migrate_amount_btc_to_sats(conn)
+        _initialized = True
+        logger.info("Database initialized successfully at %s", _db_path)
     except sqlite3.Error as e:
-        logger.error(f"Database initialization error: {e}")
+        logger.error("Database initialization error: %s", e)
         raise
     except Exception as e:
-        logger.error(f"An unexpected error occurred during DB initialization: {e}")
+        logger.error("An unexpected error occurred during DB initialization: %s", e)
         raise
 
 
+# SQL statements hoisted to module scope. Reusing the exact same string objects on the
+# long-lived connection lets sqlite3's prepared-statement cache skip re-parse/re-plan.
+_SQL_INSERT_KEY = "INSERT INTO keys (address, wif_filename, label, network, address_type) VALUES (?, ?, ?, ?, ?)"
+_SQL_INSERT_KEYS_BULK = "INSERT OR IGNORE INTO keys (address, wif_filename, label, network, address_type) VALUES (?, ?, ?, ?, ?)"
+_SQL_GET_KEY_BY_ADDRESS = "SELECT * FROM keys WHERE address = ?"
+_SQL_GET_ALL_KEYS = "SELECT * FROM keys ORDER BY creation_date DESC"
+_SQL_UPDATE_KEY_LABEL = "UPDATE keys SET label = ? WHERE address = ?"
+_SQL_INSERT_TX = "INSERT INTO transactions (txid, amount_sats, fee_sats, recipient_address, status, notes) VALUES (?, ?, ?, ?, ?, ?)"
+_SQL_INSERT_TXS_BULK = "INSERT OR IGNORE INTO transactions (txid, amount_sats, fee_sats, recipient_address, status, notes) VALUES (?, ?, ?, ?, ?, ?)"
+_SQL_GET_TX_BY_TXID = "SELECT * FROM transactions WHERE txid = ?"
+_SQL_GET_ALL_TXS = "SELECT * FROM transactions ORDER BY date DESC LIMIT ?"
+_SQL_UPDATE_TX_STATUS = "UPDATE transactions SET status = ? WHERE txid = ?"
+
+
 # --- Key Management Functions ---
 def add_key_record(address: str, network: str, address_type: str,
                    wif_filename: str = None, label: str = None):
-    sql = "INSERT INTO keys (address, wif_filename, label, network, address_type) VALUES (?, ?, ?, ?, ?)"
     try:
-        with get_db_connection() as conn:
-            conn.execute(sql, (address, wif_filename, label, network, address_type))
-            conn.commit()
-        logger.info(f"Added key record for address: {address}")
+        conn = get_db_connection()
+        with conn:
+            conn.execute(_SQL_INSERT_KEY, (address, wif_filename, label, network, address_type))
+        logger.info("Added key record for address: %s", address)
     except sqlite3.IntegrityError:
-        logger.warning(f"Key record for address {address} already exists.")
+        logger.warning("Key record for address %s already exists.", address)
+    except sqlite3.Error as e:
+        logger.error("Error adding key record for %s: %s", address, e)
+        raise
+
+def add_key_records(records: list[tuple]):
+    """
+    Bulk-inserts key records inside a single transaction.
+    Each record is a tuple: (address, wif_filename, label, network, address_type).
+    One commit (and one fsync) for the whole batch instead of one per row,
+    which matters when restoring a wallet with many keys.
+    """
+    try:
+        conn = get_db_connection()
+        with conn:
+            conn.executemany(_SQL_INSERT_KEYS_BULK, records)
+        logger.info("Bulk-added key records (batch of %s).", len(records))
     except sqlite3.Error as e:
-        logger.error(f"Error adding key record for {address}: {e}")
+        logger.error("Error bulk-adding key records: %s", e)
         raise
 
 def get_key_by_address(address: str) -> dict | None:
-    sql = "SELECT * FROM keys WHERE address = ?"
     try:
-        with get_db_connection() as conn:
-            row = conn.execute(sql, (address,)).fetchone()
+        row = get_db_connection().execute(_SQL_GET_KEY_BY_ADDRESS, (address,)).fetchone()
         return dict(row) if row else None
     except sqlite3.Error as e:
-        logger.error(f"Error fetching key by address {address}: {e}")
+        logger.error("Error fetching key by address %s: %s", address, e)
         return None
 
-def get_all_keys() -> list[dict]:
-    sql = "SELECT * FROM keys ORDER BY creation_date DESC"
+def get_keys_by_addresses(addresses: list[str]) -> dict[str, dict]:
+    """
+    Batch-fetches key records for many addresses in one query per chunk,
+    instead of one round-trip per address. Returns {address: record}.
+    Chunked at 900 placeholders to stay under SQLite's default variable limit.
+    """
+    if not addresses:
+        return {}
+    result = {}
     try:
-        with get_db_connection() as conn:
-            rows = conn.execute(sql).fetchall()
-        return [dict(row) for row in rows]
+        conn = get_db_connection()
+        for start in range(0, len(addresses), 900):
+            chunk = addresses[start:start + 900]
+            placeholders = ",".join("?" * len(chunk))
+            sql = f"SELECT * FROM keys WHERE address IN ({placeholders})"
+            for row in conn.execute(sql, tuple(chunk)):
+                result[row['address']] = dict(row)
+        return result
     except sqlite3.Error as e:
-        logger.error(f"Error fetching all keys: {e}")
-        return []
+        logger.error("Error batch-fetching keys by addresses: %s", e)
+        return result
+
+def iter_keys():
+    """Yields key records one at a time straight off the cursor (O(1) memory).
+
+    Rows come back as sqlite3.Row, which supports row['address'] / row[0] and
+    iteration just like the dicts we used to build — without allocating a dict
+    (and copying every value) per row.
+    """
+    try:
+        yield from get_db_connection().execute(_SQL_GET_ALL_KEYS)
+    except sqlite3.Error as e:
+        logger.error("Error fetching all keys: %s", e)
+
+def get_all_keys() -> list[sqlite3.Row]:
+    # Back-compat eager variant; prefer iter_keys() for large wallets.
+    return list(iter_keys())
 
 def update_key_label(address: str, new_label: str):
-    sql = "UPDATE keys SET label = ? WHERE address = ?"
     try:
-        with get_db_connection() as conn:
-            result = conn.execute(sql, (new_label, address))
-            conn.commit()
+        conn = get_db_connection()
+        with conn:
+            result = conn.execute(_SQL_UPDATE_KEY_LABEL, (new_label, address))
             if result.rowcount == 0:
-                logger.warning(f"No key found for address {address} to update label.")
+                logger.warning("No key found for address %s to update label.", address)
                 return False
-        logger.info(f"Updated label for address {address} to '{new_label}'.")
+        logger.info("Updated label for address %s to '%s'.", address, new_label)
         return True
     except sqlite3.Error as e:
-        logger.error(f"Error updating label for {address}: {e}")
+        logger.error("Error updating label for %s: %s", address, e)
         raise
 
 
 # --- Transaction Management Functions ---
-def add_transaction_record(txid: str, amount_btc: Decimal | str, fee_sats: int,
+def add_transaction_record(txid: str, amount_sats: int, fee_sats: int,
                            recipient_address: str, status: str, notes: str = None):
-    amount_btc_str = str(amount_btc) if isinstance(amount_btc, Decimal) else amount_btc
-    sql = "INSERT INTO transactions (txid, amount_btc, fee_sats, recipient_address, status, notes) VALUES (?, ?, ?, ?, ?, ?)"
     try:
-        with get_db_connection() as conn:
-            conn.execute(sql, (txid, amount_btc_str, fee_sats, recipient_address, status, notes))
-            conn.commit()
-        logger.info(f"Added transaction record: {txid}")
+        conn = get_db_connection()
+        with conn:
+            conn.execute(_SQL_INSERT_TX, (txid, amount_sats, fee_sats, recipient_address, status, notes))
+        logger.info("Added transaction record: %s", txid)
     except sqlite3.IntegrityError:
-        logger.warning(f"Transaction record for TXID {txid} already exists.")
+        logger.warning("Transaction record for TXID %s already exists.", txid)
+    except sqlite3.Error as e:
+        logger.error("Error adding transaction record for %s: %s", txid, e)
+        raise
+
+def add_transaction_records(records: list[tuple]):
+    """
+    Bulk-inserts transaction records inside a single transaction.
+    Each record is a tuple: (txid, amount_sats, fee_sats, recipient_address, status, notes).
+    Amounts must already be integer satoshis; normalization is the caller's job for batches.
+    """
+    try:
+        conn = get_db_connection()
+        with conn:
+            conn.executemany(_SQL_INSERT_TXS_BULK, records)
+        logger.info("Bulk-added transaction records (batch of %s).", len(records))
     except sqlite3.Error as e:
-        logger.error(f"Error adding transaction record for {txid}: {e}")
+        logger.error("Error bulk-adding transaction records: %s", e)
         raise
 
 def get_transaction_by_txid(txid: str) -> dict | None:
-    sql = "SELECT * FROM transactions WHERE txid = ?"
     try:
-        with get_db_connection() as conn:
-            row = conn.execute(sql, (txid,)).fetchone()
-        if row:
-            record = dict(row)
-            record['amount_btc'] = Decimal(record['amount_btc'])
-            return record
-        return None
+        row = get_db_connection().execute(_SQL_GET_TX_BY_TXID, (txid,)).fetchone()
+        # amount_sats is a raw integer; convert to BTC only at the display boundary.
+        return dict(row) if row else None
     except sqlite3.Error as e:
-        logger.error(f"Error fetching transaction by TXID {txid}: {e}")
+        logger.error("Error fetching transaction by TXID %s: %s", txid, e)
         return None
 
-def get_all_transactions(limit: int = 50) -> list[dict]:
-    sql = "SELECT * FROM transactions ORDER BY date DESC LIMIT ?"
+def iter_transactions(limit: int = 50):
+    """Yields transaction records one at a time straight off the cursor (O(1) memory).
+
+    Yields sqlite3.Row objects directly (amount_sats is already a raw integer),
+    so listing a history performs zero per-row dict allocations or conversions.
+    """
     try:
-        with get_db_connection() as conn:
-            rows = conn.execute(sql, (limit,)).fetchall()
-        processed_rows = []
-        for row in rows:
-            record = dict(row)
-            record['amount_btc'] = Decimal(record['amount_btc'])
-            processed_rows.append(record)
-        return processed_rows
+        yield from get_db_connection().execute(_SQL_GET_ALL_TXS, (limit,))
     except sqlite3.Error as e:
-        logger.error(f"Error fetching all transactions: {e}")
-        return []
+        logger.error("Error fetching all transactions: %s", e)
+
+def get_all_transactions(limit: int = 50) -> list[sqlite3.Row]:
+    # Back-compat eager variant; prefer iter_transactions() for long histories.
+    return list(iter_transactions(limit))
 
 def update_transaction_status(txid: str, new_status: str):
-    sql = "UPDATE transactions SET status = ? WHERE txid = ?"
     try:
-        with get_db_connection() as conn:
-            result = conn.execute(sql, (new_status, txid))
-            conn.commit()
+        conn = get_db_connection()
+        with conn:
+            result = conn.execute(_SQL_UPDATE_TX_STATUS, (new_status, txid))
             if result.rowcount == 0:
-                logger.warning(f"No transaction found for TXID {txid} to update status.")
+                logger.warning("No transaction found for TXID %s to update status.", txid)
                 return False
-        logger.info(f"Updated status for TXID {txid} to '{new_status}'.")
+        logger.info("Updated status for TXID %s to '%s'.", txid, new_status)
         return True
     except sqlite3.Error as e:
-        logger.error(f"Error updating status for TXID {txid}: {e}")
+        logger.error("Error updating status for TXID %s: %s", txid, e)
         raise
 
 if __name__ == '__main__':
@@ -252,8 +328,11 @@ if __name__ == '__main__':
 
     logger.info("--- Testing database operations ---")
 
-    add_key_record("testaddr1", "testnet", "p2wpkh", "mywallet.dat", "Test Key 1")
-    add_key_record("testaddr2", "mainnet", "p2pkh", "mywallet.dat", "Savings")
+    # Bulk insert via the batched API (single transaction for the whole list)
+    add_key_records([
+        ("testaddr1", "mywallet.dat", "Test Key 1", "testnet", "p2wpkh"),
+        ("testaddr2", "mywallet.dat", "Savings", "mainnet", "p2pkh"),
+    ])
     add_key_record("testaddr1", "testnet", "p2wpkh", "mywallet.dat", "Test Key 1 Duplicate")
 
     key1 = get_key_by_address("testaddr1")
@@ -270,13 +349,13 @@ if __name__ == '__main__':
     assert len(all_keys) >= 2
 
     txid1 = "txid_example_123"
-    add_transaction_record(txid1, Decimal("0.5"), 5000, "recipient_addr_1", "broadcasted", "Sent to friend")
-    add_transaction_record("txid_example_456", "1.234", 12000, "recipient_addr_2", "confirmed", "Payment for goods")
-    add_transaction_record(txid1, Decimal("0.5"), 5000, "recipient_addr_1", "broadcasted", "Duplicate TX")
+    add_transaction_record(txid1, 50_000_000, 5000, "recipient_addr_1", "broadcasted", "Sent to friend")
+    add_transaction_record("txid_example_456", 123_400_000, 12000, "recipient_addr_2", "confirmed", "Payment for goods")
+    add_transaction_record(txid1, 50_000_000, 5000, "recipient_addr_1", "broadcasted", "Duplicate TX")
 
     tx1 = get_transaction_by_txid(txid1)
     logger.info(f"Fetched transaction {txid1}: {tx1}")
-    assert tx1 and tx1['amount_btc'] == Decimal("0.5")
+    assert tx1 and tx1['amount_sats'] == 50_000_000
 
     update_transaction_status(txid1, "confirmed (6+)")
     tx1_updated = get_transaction_by_txid(txid1)
@@ -287,7 +366,7 @@ if __name__ == '__main__':
     logger.info(f"All transactions ({len(all_txs)}): {all_txs}")
     assert len(all_txs) >= 2
     if all_txs:
-        assert isinstance(all_txs[0]['amount_btc'], Decimal)
+        assert isinstance(all_txs[0]['amount_sats'], int)
 
     logger.info("--- Database operations testing finished ---")
 
@@ -0,0 +1,15 @@
+# btc_wallet_app/tests/conftest.py
+"""
+Session-level pytest setup: make the project root importable exactly once.
+
+Test modules used to mutate sys.path themselves at import time, repeating the
+abspath/dirname walk per collected module. conftest.py is imported once per
+session before any test module, so the insert happens here and nowhere else.
+A no-op when the package is installed (pip install -e .).
+"""
+import os
+import sys
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
@@ -0,0 +1,86 @@
+# btc_wallet_app/tests/test_key_manager.py
+"""
+Tests for key_manager, replacing its old __main__ self-test block.
+
+The expensive steps — key generation and the scrypt derivation inside
+encrypt/decrypt — run once in module-scoped fixtures and are reused across
+assertions, instead of re-running per check like the self-test did.
+"""
+import sys
+
+import pytest
+
+# Path setup lives in conftest.py (see test_tx_flow.py for the same pattern).
+try:
+    from btc_wallet_app.wallet import key_manager
+except ImportError as e_imp:
+    print(f"CRITICAL: test_key_manager.py could not import key_manager: {e_imp}", file=sys.stderr)
+    key_manager = None
+
+pytestmark = pytest.mark.skipif(
+    key_manager is None,
+    reason="key_manager (or its crypto dependencies) is not importable.")
+
+PASSWORD = "supersecretpassword"
+
+
+@pytest.fixture(scope='module')
+def generated_key():
+    """One generated key for the whole module — EC keygen runs once."""
+    return key_manager.generate_wif_key(network_name='testnet', address_type='p2wpkh')
+
+
+@pytest.fixture(scope='module')
+def wallet_file(tmp_path_factory, generated_key):
+    """An encrypted wallet file on disk; scrypt + AES run once, tests reuse it."""
+    path = tmp_path_factory.mktemp("keys") / "test_wallet.enc"
+    key_manager.save_encrypted_key(generated_key, PASSWORD, str(path))
+    return str(path)
+
+
+def test_generate_wif_key_fields(generated_key):
+    for field in ('wif', 'address', 'addresses', 'private_key_hex',
+                  'public_key_hex', 'network', 'address_type'):
+        assert field in generated_key
+    assert generated_key['network'] == 'testnet'
+    assert generated_key['address_type'] == 'p2wpkh'
+    assert generated_key['address'] == generated_key['addresses']['p2wpkh']
+    assert generated_key['addresses']['p2wpkh'].startswith('tb1')
+
+
+def test_generate_rejects_unknown_address_type():
+    with pytest.raises(ValueError):
+        key_manager.generate_wif_key(network_name='testnet', address_type='p2tr')
+
+
+def test_import_round_trip(generated_key):
+    imported = key_manager.import_wif_key(generated_key['wif'],
+                                          network_name='testnet',
+                                          address_type='p2wpkh')
+    assert imported['address'] == generated_key['address']
+    assert imported['public_key_hex'] == generated_key['public_key_hex']
+
+
+def test_import_rejects_malformed_wif():
+    with pytest.raises(ValueError):
+        key_manager.import_wif_key("definitely-not-a-wif", network_name='testnet')
+
+
+def test_load_encrypted_key_round_trip(wallet_file, generated_key):
+    loaded = key_manager.load_encrypted_key(wallet_file, PASSWORD)
+    assert loaded['wif'] == generated_key['wif']
+    assert loaded['address'] == generated_key['address']
+
+
+def test_load_encrypted_key_wrong_password(wallet_file):
+    with pytest.raises(ValueError):
+        key_manager.load_encrypted_key(wallet_file, "wrongpassword")
+
+
+def test_append_and_load_encrypted_keys(tmp_path, generated_key):
+    path = str(tmp_path / "wallet.keys")
+    key_manager.append_encrypted_key(generated_key, PASSWORD, path)
+    key_manager.append_encrypted_key(generated_key, PASSWORD, path)
+    keys = key_manager.load_encrypted_keys(path, PASSWORD)
+    assert len(keys) == 2
+    assert all(k['wif'] == generated_key['wif'] for k in keys)
@@ -1,8 +1,15 @@
 # btc_wallet_app/utils/fee_estimator.py
+import functools
 from decimal import Decimal
+from typing import NamedTuple
 import sys # For path manipulation
 import os
 
+try:
+    import numpy as np # Optional: enables vectorized batch fee estimation
+except ImportError:
+    np = None
+
 try:
     # Assuming 'btc_wallet_app' is in PYTHONPATH
     from btc_wallet_app import config as wallet_config
@@ -22,6 +29,57 @@ except ImportError:
         wallet_config = FallbackConfig()
 
 
+try:
+    from btc_wallet_app.utils.logger import get_logger
+except ImportError:
+    # Direct execution: the config fallback above put the package directory on
+    # sys.path, so utils resolves as a top-level package. An unconditional
+    # package import here would defeat that fallback entirely.
+    from utils.logger import get_logger
+
+_log = get_logger(__name__)
+
+# Types we've already warned about: unknown-type warnings are emitted once per
+# type per process, not once per estimate (a selection sweep over mixed UTXOs
+# used to print the same warning hundreds of times).
+_warned: set[str] = set()
+
+
+# Config attribute bound once at import: fee defaulting on the hot estimation
+# paths becomes a module-global load instead of an attribute lookup on the
+# config module per call. getattr keeps the fallback config working too.
+_DEFAULT_FEE = getattr(wallet_config, 'DEFAULT_FEE_SATS_PER_BYTE', 10)
+
+
+# Per-type size tables: a dict lookup replaces the old if/elif chains, so the
+# hot path in estimate_transaction_size_bytes is a couple of hash lookups
+# regardless of how many script types we end up supporting.
+_INPUT_VBYTES = {
+    'p2wpkh': 68,   # SegWit: 41 base bytes * 4 weight + ~106 witness bytes, /4
+    'p2pkh': 148,   # Legacy: full ~107-byte scriptSig counted at full weight
+}
+_INPUT_VBYTES_FALLBACK = 100  # Very rough estimate for unknown input types
+
+_OUTPUT_VBYTES = {
+    'p2pkh': 34,    # Value (8) + script length (1) + script (25)
+    'p2wpkh': 31,   # Value (8) + script length (1) + script (22)
+    'p2sh': 32,     # Value (8) + script length (1) + script (23); P2SH-P2WPKH etc.
+}
+_OUTPUT_VBYTES_FALLBACK = 34
+
+
+class FeeEstimate(NamedTuple):
+    """
+    Result of a fee estimation. A NamedTuple instead of a dict: no per-call
+    dict allocation or string hashing, which adds up when coin selection calls
+    estimate_fee_details once per candidate input set. Field names match the
+    keys the old dict used, accessed as attributes (fe.total_fee_sats).
+    """
+    estimated_size_vbytes: int
+    fee_rate_sats_per_vbyte: int
+    total_fee_sats: int
+
+
 # This function is moved from tx_builder.py
 def estimate_transaction_size_bytes(num_inputs: int, num_outputs: int,
                                input_type: str = 'p2wpkh', output_type: str = 'p2pkh') -> int:
@@ -43,56 +101,120 @@ def estimate_transaction_size_bytes(num_inputs: int, num_outputs: int,
     Base transaction overhead (version, locktime, nInputs varint, nOutputs varint): ~10-12 bytes.
     Using a common estimate for overhead.
     """
-    input_vbytes = 0
-    if input_type == 'p2wpkh':
-        input_vbytes = 68
-    elif input_type == 'p2pkh':
-        input_vbytes = 148
-    else: # Fallback, very rough estimate
-        print(f"Warning: Unknown input_type '{input_type}' for size estimation, using 100 vB fallback.")
-        input_vbytes = 100
-
-    output_vbytes = 0
-    if output_type == 'p2pkh':
-        output_vbytes = 34
-    elif output_type == 'p2wpkh':
-        output_vbytes = 31
-    elif output_type == 'p2sh': # For P2SH-P2WPKH outputs etc.
-        output_vbytes = 32
-    else: # Fallback
-        print(f"Warning: Unknown output_type '{output_type}' for size estimation, using 34 vB fallback.")
-        output_vbytes = 34
-
-    # Overhead: version (4 bytes), input count varint (1-9), output count varint (1-9), locktime (4 bytes)
-    # Simplified fixed overhead, can be more precise by calculating varint sizes for input/output counts.
-    # For 1 input, 1 output, varints are 1 byte each.
-    overhead_vbytes = 10
-    if num_inputs > 252: overhead_vbytes += 2 # Varint for num_inputs becomes 3 bytes
-    if num_outputs > 252: overhead_vbytes += 2 # Varint for num_outputs becomes 3 bytes
-    # This is still simplified.
-
-    estimated_vbytes = (num_inputs * input_vbytes) + (num_outputs * output_vbytes) + overhead_vbytes
-    return estimated_vbytes
+    return _size_fn(input_type, output_type)(num_inputs, num_outputs)
+
+@functools.lru_cache(maxsize=16)
+def _size_fn(input_type: str, output_type: str):
+    """
+    Returns a closure computing the vbyte size for a fixed (input_type,
+    output_type) pair, with the per-type sizes baked in as locals. An app run
+    uses one or two type pairs, fixed at wallet creation, so the table lookups
+    and fallback warnings run once per pair; the closure in the hot selection
+    loop is a bare multiply/add chain.
+    """
+    input_vbytes = _INPUT_VBYTES.get(input_type)
+    if input_vbytes is None: # Fallback, very rough estimate
+        if input_type not in _warned:
+            _log.warning("Unknown input_type '%s' for size estimation, using %d vB fallback.",
+                         input_type, _INPUT_VBYTES_FALLBACK)
+            _warned.add(input_type)
+        input_vbytes = _INPUT_VBYTES_FALLBACK
+
+    output_vbytes = _OUTPUT_VBYTES.get(output_type)
+    if output_vbytes is None: # Fallback
+        if output_type not in _warned:
+            _log.warning("Unknown output_type '%s' for size estimation, using %d vB fallback.",
+                         output_type, _OUTPUT_VBYTES_FALLBACK)
+            _warned.add(output_type)
+        output_vbytes = _OUTPUT_VBYTES_FALLBACK
+
+    def size(num_inputs: int, num_outputs: int) -> int:
+        # Overhead: version (4 bytes), input count varint (1-9), output count
+        # varint (1-9), locktime (4 bytes). Simplified fixed overhead; the
+        # varints grow to 3 bytes past 252 entries.
+        overhead_vbytes = 10
+        if num_inputs > 252: overhead_vbytes += 2 # Varint for num_inputs becomes 3 bytes
+        if num_outputs > 252: overhead_vbytes += 2 # Varint for num_outputs becomes 3 bytes
+        return (num_inputs * input_vbytes) + (num_outputs * output_vbytes) + overhead_vbytes
+
+    return size
 
 def estimate_fee_details(num_inputs: int, num_outputs: int,
                          input_type: str = 'p2wpkh', output_type: str = 'p2pkh',
-                         custom_fee_rate_sats_per_vbyte: int = None) -> dict:
+                         custom_fee_rate_sats_per_vbyte: int = None) -> FeeEstimate:
     """
     Estimates transaction fee details based on size and fee rate.
-    Returns a dictionary with 'estimated_size_vbytes', 'fee_rate_sats_per_vbyte', 'total_fee_sats'.
+    Returns a FeeEstimate with estimated_size_vbytes, fee_rate_sats_per_vbyte
+    and total_fee_sats.
+    """
+    estimated_size_vbytes = _size_fn(input_type, output_type)(num_inputs, num_outputs)
+
+    fee_rate_to_use = custom_fee_rate_sats_per_vbyte if custom_fee_rate_sats_per_vbyte is not None \
+                      else _DEFAULT_FEE
+
+    return FeeEstimate(estimated_size_vbytes, fee_rate_to_use,
+                       estimated_size_vbytes * fee_rate_to_use)
+
+def estimate_transaction_size_bytes_vec(num_inputs_arr, num_outputs_arr,
+                                        input_type: str = 'p2wpkh', output_type: str = 'p2pkh'):
+    """
+    Vectorized variant of estimate_transaction_size_bytes for whole candidate sets
+    (e.g. sizing every prefix during coin selection). Takes array-likes of input and
+    output counts and returns a numpy int array of vbyte sizes. Requires numpy;
+    callers should fall back to the scalar function in a loop when np is None.
     """
-    estimated_size_vbytes = estimate_transaction_size_bytes(num_inputs, num_outputs, input_type, output_type)
+    if np is None:
+        raise RuntimeError("numpy is not installed; use estimate_transaction_size_bytes instead.")
+    input_vbytes = _INPUT_VBYTES.get(input_type, _INPUT_VBYTES_FALLBACK)
+    output_vbytes = _OUTPUT_VBYTES.get(output_type, _OUTPUT_VBYTES_FALLBACK)
 
+    num_inputs_arr = np.asarray(num_inputs_arr, dtype=np.int64)
+    num_outputs_arr = np.asarray(num_outputs_arr, dtype=np.int64)
+
+    overhead = np.full(num_inputs_arr.shape, 10, dtype=np.int64)
+    overhead += np.where(num_inputs_arr > 252, 2, 0)   # 3-byte varint for input count
+    overhead += np.where(num_outputs_arr > 252, 2, 0)  # 3-byte varint for output count
+
+    return num_inputs_arr * input_vbytes + num_outputs_arr * output_vbytes + overhead
+
+def estimate_fee_details_vec(num_inputs_arr, num_outputs_arr,
+                             input_type: str = 'p2wpkh', output_type: str = 'p2pkh',
+                             custom_fee_rate_sats_per_vbyte: int = None):
+    """
+    Vectorized fee estimation: one numpy multiply instead of N Python calls.
+    Returns a FeeEstimate whose size/fee fields hold numpy arrays.
+    """
+    sizes = estimate_transaction_size_bytes_vec(num_inputs_arr, num_outputs_arr,
+                                                input_type, output_type)
     fee_rate_to_use = custom_fee_rate_sats_per_vbyte if custom_fee_rate_sats_per_vbyte is not None \
-                      else wallet_config.DEFAULT_FEE_SATS_PER_BYTE
+                      else _DEFAULT_FEE
+    return FeeEstimate(sizes, fee_rate_to_use, sizes * fee_rate_to_use)
 
-    total_fee_sats = estimated_size_vbytes * fee_rate_to_use
+def effective_value(amount_sats: int, input_type: str = 'p2wpkh',
+                    fee_rate_sats_per_vbyte: int = None) -> int:
+    """
+    Effective value of a UTXO: its amount minus the fee its own input adds to a
+    transaction. Coin selection should compare effective values, not raw
+    amounts — a 600-sat P2PKH UTXO at 10 sat/vB is worth less than nothing.
+    """
+    fee_rate = fee_rate_sats_per_vbyte if fee_rate_sats_per_vbyte is not None \
+               else _DEFAULT_FEE
+    input_vbytes = _INPUT_VBYTES.get(input_type, _INPUT_VBYTES_FALLBACK)
+    return amount_sats - input_vbytes * fee_rate
 
-    return {
-        'estimated_size_vbytes': estimated_size_vbytes,
-        'fee_rate_sats_per_vbyte': fee_rate_to_use,
-        'total_fee_sats': total_fee_sats
-    }
+def effective_values(amounts_sats, input_type: str = 'p2wpkh',
+                     fee_rate_sats_per_vbyte: int = None):
+    """
+    Vectorized effective_value over an array-like of satoshi amounts.
+    Returns a numpy int array when numpy is available, else a plain list.
+    """
+    fee_rate = fee_rate_sats_per_vbyte if fee_rate_sats_per_vbyte is not None \
+               else _DEFAULT_FEE
+    input_vbytes = _INPUT_VBYTES.get(input_type, _INPUT_VBYTES_FALLBACK)
+    input_fee = input_vbytes * fee_rate
+    if np is not None:
+        return np.asarray(amounts_sats, dtype=np.int64) - input_fee
+    return [amount - input_fee for amount in amounts_sats]
 
 # Future:
 # def get_dynamic_fee_rate_from_core(rpc_conn, confirmation_target_blocks=6):
@@ -119,15 +241,15 @@ if __name__ == '__main__':
     print("Testing fee_estimator.py...")
 
     details_p2wpkh = estimate_fee_details(num_inputs=1, num_outputs=2, input_type='p2wpkh')
-    print(f"P2WPKH (1 in, 2 out): Size={details_p2wpkh['estimated_size_vbytes']} vB, "
-          f"Rate={details_p2wpkh['fee_rate_sats_per_vbyte']} sat/vB, Fee={details_p2wpkh['total_fee_sats']} sats")
+    print(f"P2WPKH (1 in, 2 out): Size={details_p2wpkh.estimated_size_vbytes} vB, "
+          f"Rate={details_p2wpkh.fee_rate_sats_per_vbyte} sat/vB, Fee={details_p2wpkh.total_fee_sats} sats")
 
     details_p2pkh = estimate_fee_details(num_inputs=1, num_outputs=2, input_type='p2pkh')
-    print(f"P2PKH (1 in, 2 out): Size={details_p2pkh['estimated_size_vbytes']} vB, "
-          f"Rate={details_p2pkh['fee_rate_sats_per_vbyte']} sat/vB, Fee={details_p2pkh['total_fee_sats']} sats")
+    print(f"P2PKH (1 in, 2 out): Size={details_p2pkh.estimated_size_vbytes} vB, "
+          f"Rate={details_p2pkh.fee_rate_sats_per_vbyte} sat/vB, Fee={details_p2pkh.total_fee_sats} sats")
 
     details_custom_rate = estimate_fee_details(num_inputs=2, num_outputs=3, input_type='p2wpkh', custom_fee_rate_sats_per_vbyte=50)
-    print(f"P2WPKH (2 in, 3 out, custom rate): Size={details_custom_rate['estimated_size_vbytes']} vB, "
-          f"Rate={details_custom_rate['fee_rate_sats_per_vbyte']} sat/vB, Fee={details_custom_rate['total_fee_sats']} sats")
+    print(f"P2WPKH (2 in, 3 out, custom rate): Size={details_custom_rate.estimated_size_vbytes} vB, "
+          f"Rate={details_custom_rate.fee_rate_sats_per_vbyte} sat/vB, Fee={details_custom_rate.total_fee_sats} sats")
 
-    print(f"Default fee rate from config: {wallet_config.DEFAULT_FEE_SATS_PER_BYTE} sat/vB")
+    print(f"Default fee rate from config: {_DEFAULT_FEE} sat/vB")
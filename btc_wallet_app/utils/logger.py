@@ -1,4 +1,5 @@
 # btc_wallet_app/utils/logger.py
+import functools
 import logging
 import os
 import sys # Added for stderr printing
@@ -29,52 +30,60 @@ except ImportError:
         wallet_config = FallbackConfig()
 
 
-# Determine log file path from config
-_log_file_path = wallet_config.LOG_FILE
-if not os.path.isabs(_log_file_path) and hasattr(wallet_config, 'BASE_DIR') and wallet_config.BASE_DIR:
-    # Make path absolute if BASE_DIR is provided and log_file_path is relative
-    # If BASE_DIR is '.', it becomes current working directory.
-    # For consistency, if BASE_DIR is '.', make it relative to project root (btc_wallet_app directory)
-    if wallet_config.BASE_DIR == ".":
-        # Assuming this script is in btc_wallet_app/utils/logger.py
-        # project_root becomes btc_wallet_app/
-        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        _log_file_path = os.path.join(project_root, _log_file_path)
-    else:
-        _log_file_path = os.path.join(wallet_config.BASE_DIR, _log_file_path)
-else:
-    # If _log_file_path is already absolute, or no BASE_DIR, use it as is (or CWD if relative & no BASE_DIR)
-    if not os.path.isabs(_log_file_path):
-        _log_file_path = os.path.abspath(_log_file_path)
-
-
-# Ensure log directory exists
-_log_dir = os.path.dirname(_log_file_path)
-if _log_dir and not os.path.exists(_log_dir):
+@functools.lru_cache(maxsize=1)
+def _resolved_log_path() -> str:
+    """
+    Resolves the log file path and makes sure its directory exists. Path policy
+    lives in paths.log_file(); the local resolution below only backs up direct
+    script execution, where the package form is not importable. Cached so the
+    resolution and the directory stat/makedirs run once per process instead of
+    at every import of this module (path resolution used to happen at module
+    load, on the import critical path of every command).
+    """
     try:
-        os.makedirs(_log_dir, exist_ok=True) # exist_ok=True is helpful
-    except OSError as e:
-        print(f"Warning: Could not create log directory {_log_dir}: {e}", file=sys.stderr)
-        # Fallback to logging in current directory or disable file logging if dir creation fails
-        _log_file_path = os.path.basename(_log_file_path) if _log_file_path else "wallet_fallback.log"
-        _log_file_path = os.path.abspath(_log_file_path)
-
-
-_logger_initialized = False
-_app_logger = None
+        from btc_wallet_app import paths
+        log_file_path = str(paths.log_file())
+    except ImportError:
+        log_file_path = wallet_config.LOG_FILE
+        if not os.path.isabs(log_file_path) and getattr(wallet_config, 'BASE_DIR', None):
+            # Make path absolute if BASE_DIR is provided and log_file_path is relative.
+            # For consistency, if BASE_DIR is '.', make it relative to project root
+            # (the btc_wallet_app directory) rather than the current working directory.
+            if wallet_config.BASE_DIR == ".":
+                project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+                log_file_path = os.path.join(project_root, log_file_path)
+            else:
+                log_file_path = os.path.join(wallet_config.BASE_DIR, log_file_path)
+        elif not os.path.isabs(log_file_path):
+            log_file_path = os.path.abspath(log_file_path)
+
+    # Ensure the log directory exists; isdir first so the common case (it already
+    # exists) is one stat with no syscall churn from makedirs.
+    log_dir = os.path.dirname(log_file_path)
+    if log_dir and not os.path.isdir(log_dir):
+        try:
+            os.makedirs(log_dir, exist_ok=True)
+        except OSError as e:
+            print(f"Warning: Could not create log directory {log_dir}: {e}", file=sys.stderr)
+            # Fallback to logging in current directory if dir creation fails
+            log_file_path = os.path.abspath(os.path.basename(log_file_path) or "wallet_fallback.log")
+    return log_file_path
+
+
+# Configured loggers by name. A plain dict hit is the whole fast path: callers
+# like database.py call get_logger(__name__) freely, so repeat calls must cost
+# one lookup — no logging.getLogger, no hasHandlers walk up the logger tree.
+_cache: dict[str, logging.Logger] = {}
 
 def get_logger(name="btc_wallet_app", level=logging.INFO, log_to_console=True):
     """
     Configures and returns a logger instance.
-    Logger is configured only once.
+    Each name is configured only once; subsequent calls (with any arguments)
+    return the cached instance as is.
     """
-    global _logger_initialized, _app_logger
-
-    if _logger_initialized and _app_logger:
-        # Ensure the existing logger's level is appropriate if called with a different level
-        # This might not be ideal; usually, first call sets the level.
-        # For simplicity, we return the existing logger as is.
-        return _app_logger
+    cached = _cache.get(name)
+    if cached is not None:
+        return cached
 
     logger = logging.getLogger(name)
     logger.setLevel(level)
@@ -87,13 +96,16 @@ def get_logger(name="btc_wallet_app", level=logging.INFO, log_to_console=True):
     formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
     # File Handler
+    log_file_path = _resolved_log_path()
     try:
-        fh = logging.FileHandler(_log_file_path)
+        # delay=True defers opening the file until the first record is emitted,
+        # so configuring the logger costs no open()/fd for commands that never log.
+        fh = logging.FileHandler(log_file_path, delay=True)
         fh.setLevel(level)
         fh.setFormatter(formatter)
         logger.addHandler(fh)
     except Exception as e:
-        print(f"Warning: Could not set up file logger for {_log_file_path}: {e}", file=sys.stderr)
+        print(f"Warning: Could not set up file logger for {log_file_path}: {e}", file=sys.stderr)
 
 
     # Console Handler
@@ -105,8 +117,7 @@ def get_logger(name="btc_wallet_app", level=logging.INFO, log_to_console=True):
 
     logger.propagate = False # Prevent messages from propagating to the root logger
 
-    _app_logger = logger
-    _logger_initialized = True
+    _cache[name] = logger
     return logger
 
 if __name__ == '__main__':
@@ -117,7 +128,7 @@ if __name__ == '__main__':
     logger.warning("This is a warning message.")
     logger.error("This is an error message.")
 
-    print(f"Log file should be at: {os.path.abspath(_log_file_path)}")
+    print(f"Log file should be at: {_resolved_log_path()}")
 
     # Test that calling get_logger again returns the same instance without reconfiguring handlers
     logger2 = get_logger()
@@ -1,4 +1,5 @@
 # btc_wallet_app/wallet/broadcaster.py
+from bitcoinrpc.authproxy import JSONRPCException
 
 # Assuming config.py and utxo_manager.py are structured to be importable
 try:
@@ -21,6 +22,50 @@ except ImportError:
         pass # Let Python raise ImportError if not found after these attempts
 
 
+class AlreadyInMempool(ValueError):
+    """Core rejected the broadcast with -27: the transaction is already in the
+    mempool. Safe for callers to treat as success (idempotent retry)."""
+
+
+class MempoolPolicyError(ValueError):
+    """Core rejected the broadcast with -26: the transaction violates mempool
+    policy (fee too low, conflicts, non-standard script, ...)."""
+
+
+class MissingInputsError(ValueError):
+    """Core rejected the broadcast with -25: inputs are missing or already spent."""
+
+
+# Error code -> exception class; classification is one integer dict lookup, and
+# callers can catch the specific type instead of re-parsing message strings.
+_RPC_ERRORS = {
+    -27: AlreadyInMempool,
+    -26: MempoolPolicyError,
+    -25: MissingInputsError,
+}
+
+
+def _raise_classified_rpc_error(e: JSONRPCException, context: str):
+    """Maps a JSONRPCException to the matching typed error (ValueError fallback)."""
+    error = e.error if isinstance(e.error, dict) else {}
+    exc_class = _RPC_ERRORS.get(error.get('code'), ValueError)
+    raise exc_class(f"Bitcoin Core RPC error during {context}: {error.get('message', str(e))}")
+
+
+# The proxy cache lives in utxo_manager now, shared by every RPC caller in the
+# app (fetching, signing, broadcasting) — one keep-alive connection per process
+# instead of one per module. These thin wrappers keep this module's call sites
+# unchanged.
+def _get_cached_rpc():
+    """Returns the process-wide shared RPC proxy (see utxo_manager)."""
+    return utxo_manager.get_rpc_connection()
+
+
+def _invalidate_cached_rpc():
+    """Drops the shared proxy so the next call reconnects from scratch."""
+    utxo_manager.invalidate_rpc_connection()
+
+
 def broadcast_transaction(signed_tx_hex: str) -> str:
     """
     Broadcasts a signed transaction to the Bitcoin network via Bitcoin Core's
@@ -40,31 +85,87 @@ def broadcast_transaction(signed_tx_hex: str) -> str:
         raise ValueError("Signed transaction hex cannot be empty.")
 
     try:
-        rpc_conn = utxo_manager.get_rpc_connection()
-
-        # The `maxfeerate` parameter for `sendrawtransaction` can be used to prevent broadcasting
-        # if the transaction's fee rate is too high. Default is 0 (no limit enforced by this arg,
-        # but node might have its own `-maxTxFee` limit).
-        # For simplicity, we are not using `maxfeerate` here, letting Core use its defaults.
-        # If needed, it would be: rpc_conn.sendrawtransaction(signed_tx_hex, maxfeerate_val_sat_vb)
-        txid = rpc_conn.sendrawtransaction(signed_tx_hex)
+        rpc_conn = _get_cached_rpc()
+
+        # maxfeerate=0 disables Core's fee-rate sanity cap for this broadcast.
+        # Invariant: every transaction reaching this function had its fee chosen
+        # wallet-side via fee_estimator (tx_builder subtracts the estimated fee
+        # during construction), so Core's default 0.10 BTC/kvB check is redundant
+        # and skipping it avoids spurious "max-fee-exceeded" rejections on
+        # deliberately high-priority sends.
+        try:
+            txid = rpc_conn.sendrawtransaction(signed_tx_hex, 0)
+        except (ConnectionError, BrokenPipeError):
+            # The cached connection can go stale (node restart, keep-alive timeout).
+            # Reconnect once and retry; any further failure propagates normally.
+            _invalidate_cached_rpc()
+            rpc_conn = _get_cached_rpc()
+            txid = rpc_conn.sendrawtransaction(signed_tx_hex, 0)
 
         return txid
 
     except ConnectionError as ce:
         # This is raised by get_rpc_connection or if the call itself fails at connection level
+        _invalidate_cached_rpc()
+        raise ConnectionError(f"Failed to connect to Bitcoin Core for broadcasting: {ce}")
+    except JSONRPCException as e:
+        _raise_classified_rpc_error(e, "sendrawtransaction")
+    except Exception as e:
+        raise ValueError(f"Bitcoin Core RPC error during sendrawtransaction: {e}")
+
+
+def broadcast_transactions(signed_tx_hexes: list[str]) -> list[str]:
+    """
+    Broadcasts several signed transactions in a single JSON-RPC batch request.
+
+    AuthServiceProxy's batch_() sends all calls in one HTTP round trip, so the
+    per-call overhead (connection handling, headers, auth) is paid once instead
+    of once per transaction.
+
+    Args:
+        signed_tx_hexes: List of signed transaction hex strings.
+
+    Returns:
+        The list of TXIDs, in the same order as the input.
+
+    Raises:
+        ConnectionError: If connection to Bitcoin Core fails.
+        ValueError: If the list is empty/contains empty entries, or if Core
+                    rejects any transaction in the batch. batch_ aborts at the
+                    first rejection without reporting which call failed; to
+                    isolate the offender, re-send via broadcast_transaction.
+    """
+    if not signed_tx_hexes:
+        raise ValueError("No signed transactions to broadcast.")
+    if any(not tx_hex for tx_hex in signed_tx_hexes):
+        raise ValueError("Signed transaction hex cannot be empty.")
+
+    # Same maxfeerate=0 invariant as broadcast_transaction: fees were vetted
+    # wallet-side by fee_estimator before the transactions got here.
+    # AuthServiceProxy.batch_ pops the method name off each inner list while
+    # building the request, so the call list must be rebuilt for every attempt
+    # — re-passing a consumed list would post the tx hexes as method names.
+    def _make_batch_calls():
+        return [["sendrawtransaction", tx_hex, 0] for tx_hex in signed_tx_hexes]
+
+    try:
+        rpc_conn = _get_cached_rpc()
+        try:
+            return rpc_conn.batch_(_make_batch_calls())
+        except (ConnectionError, BrokenPipeError):
+            # Stale cached connection: reconnect once and retry the whole batch.
+            _invalidate_cached_rpc()
+            rpc_conn = _get_cached_rpc()
+            return rpc_conn.batch_(_make_batch_calls())
+    except ConnectionError as ce:
+        _invalidate_cached_rpc()
         raise ConnectionError(f"Failed to connect to Bitcoin Core for broadcasting: {ce}")
-    except Exception as e: # Catches JSONRPCException from bitcoinrpc.authproxy and other errors
-        error_message = str(e)
-        if hasattr(e, 'error') and isinstance(e.error, dict) and 'message' in e.error:
-            error_message = e.error['message']
-
-        # Provide more specific error messages for common sendrawtransaction issues if possible
-        # These error messages/codes can vary slightly between Bitcoin Core versions.
-        # Example common error string: "txn-mempool-conflict"
-        # Example error code: -26 (generic error), -27 (txn-already-in-mempool)
-        # For now, a general message:
-        raise ValueError(f"Bitcoin Core RPC error during sendrawtransaction: {error_message}")
+    except JSONRPCException as e:
+        _raise_classified_rpc_error(
+            e, "batched sendrawtransaction (batch aborted at the first rejected "
+               "transaction; broadcast individually to isolate it)")
+    except Exception as e:
+        raise ValueError(f"Bitcoin Core RPC error during batched sendrawtransaction: {e}")
 
 
 if __name__ == '__main__':
@@ -1,30 +1,193 @@
 # btc_wallet_app/wallet/key_manager.py
+import base64
 import os
 import json
+import functools
 import hashlib
-import base64
+import re
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson # C-level JSON; ~10x faster than stdlib for the wallet payload
+except ImportError:
+    orjson = None # Optional; stdlib json is the fallback
+
+try:
+    import coincurve # libsecp256k1 bindings; pubkey derivation via precomputed tables
+except ImportError:
+    coincurve = None # Optional; bitcoinlib's Key handles generation/import without it
+
+try:
+    # Native Base58Check; the repeated divmod-by-58 is the hot part of WIF and
+    # P2PKH encoding and the C loop is an order of magnitude faster than ours.
+    from base58 import b58encode_check as _b58encode_check_native
+except ImportError:
+    _b58encode_check_native = None # Optional; pure-Python encoder below is the fallback
 
 from bitcoinlib.keys import Key, Address # CKey is Key in newer versions
 from bitcoinlib.networks import Network # Removed network_by_name
-from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-from cryptography.hazmat.backends import default_backend
+from cryptography.fernet import Fernet # Legacy wallets only; see _decrypt_legacy_key_data
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
 # Placeholder for now, will be used from config.py
 DEFAULT_NETWORK = 'bitcoin' # bitcoin for mainnet, bitcoin_testnet for testnet
 
-def _derive_encryption_key(password: str, salt: bytes) -> bytes:
-    """Derives a 32-byte key for Fernet encryption from a password and salt."""
-    kdf = PBKDF2HMAC(
-        algorithm=hashes.SHA256(),
-        length=32,
+# scrypt cost parameters: n=2^15, r=8 is ~32 MiB of memory hardness, which makes
+# GPU/ASIC brute-force far more expensive than iterated PBKDF2-SHA256 at a similar
+# wall-clock cost (the heavy lifting happens in OpenSSL, not in Python).
+_SCRYPT_N = 2**15
+_SCRYPT_R = 8
+_SCRYPT_P = 1
+
+@functools.lru_cache(maxsize=32)
+def _derive_cached(password_bytes: bytes, salt: bytes) -> bytes:
+    """Memoized scrypt derivation keyed by (password, salt).
+
+    The KDF is intentionally slow; caching the result means a session that
+    repeatedly unlocks the same blob (or decrypts right after encrypting)
+    pays the scrypt cost once instead of per call. The cache deliberately
+    stays tiny — it holds derived keys in memory.
+
+    hashlib.scrypt dispatches straight to OpenSSL with no per-call KDF
+    object construction (the cryptography.Scrypt wrapper rebuilt one per
+    derivation). maxmem needs headroom above the ~n*r*128 bytes the
+    parameters require or OpenSSL rejects the call.
+    """
+    return hashlib.scrypt(
+        password_bytes,
         salt=salt,
-        iterations=100000, # OWASP recommendation
-        backend=default_backend()
+        n=_SCRYPT_N,
+        r=_SCRYPT_R,
+        p=_SCRYPT_P,
+        maxmem=_SCRYPT_N * _SCRYPT_R * 2 * 128,
+        dklen=32,
     )
-    key = base64.urlsafe_b64encode(kdf.derive(password.encode()))
-    return key
+
+def _derive_encryption_key(password: str, salt: bytes) -> bytes:
+    """Derives a raw 32-byte AES-256-GCM key from a password and salt via scrypt."""
+    return _derive_cached(password.encode(), salt)
+
+def clear_derived_key_cache():
+    """
+    Drops all memoized derived keys (e.g. on wallet lock or app shutdown).
+    Every blob has its own salt, so loading a multi-key wallet.keys file fills
+    one cache slot per blob — hence the cache is sized for a whole file and
+    this gives callers an explicit way to purge key material from memory.
+    """
+    _derive_cached.cache_clear()
+
+# Supported script/address types; one frozenset membership test replaces the
+# if/elif chains generate_wif_key and import_wif_key each carried.
+_SCRIPT_TYPES = frozenset({'p2pkh', 'p2wpkh'})
+
+# (P2PKH version byte, bech32 HRP, WIF version byte) per network. Both the
+# bitcoinlib-style names and the short names the CLI maps to are accepted.
+_NET_PARAMS = {
+    'bitcoin': (0x00, 'bc', 0x80),
+    'bitcoin_testnet': (0x6f, 'tb', 0xef),
+    'testnet': (0x6f, 'tb', 0xef),
+    'bitcoin_regtest': (0x6f, 'bcrt', 0xef),
+    'regtest': (0x6f, 'bcrt', 0xef),
+}
+
+_B58_ALPHABET = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+_B58_INDEX = {c: i for i, c in enumerate(_B58_ALPHABET)}
+
+def _b58check_encode(version: int, payload: bytes) -> str:
+    """Base58Check encodes version byte + payload (double-SHA256 checksum)."""
+    data = bytes([version]) + payload
+    if _b58encode_check_native is not None:
+        # The native routine computes the checksum itself
+        return _b58encode_check_native(data).decode('ascii')
+    data += hashlib.sha256(hashlib.sha256(data).digest()).digest()[:4]
+    n = int.from_bytes(data, 'big')
+    encoded = []
+    while n:
+        n, rem = divmod(n, 58)
+        encoded.append(_B58_ALPHABET[rem])
+    # Leading zero bytes encode as '1'
+    pad = len(data) - len(data.lstrip(b'\x00'))
+    return '1' * pad + ''.join(reversed(encoded))
+
+def _b58check_decode(encoded: str) -> bytes:
+    """Base58Check decodes to version byte + payload, verifying the checksum."""
+    n = 0
+    for ch in encoded:
+        n = n * 58 + _B58_INDEX[ch]
+    data = n.to_bytes((n.bit_length() + 7) // 8, 'big')
+    # Leading '1' characters decode back to zero bytes
+    pad = len(encoded) - len(encoded.lstrip('1'))
+    data = b'\x00' * pad + data
+    payload, checksum = data[:-4], data[-4:]
+    if hashlib.sha256(hashlib.sha256(payload).digest()).digest()[:4] != checksum:
+        raise ValueError("Base58Check checksum mismatch.")
+    return payload
+
+# WIF shape prescreen: prefix '5'/'9' (uncompressed main/test) or 'K'/'L'/'c'
+# (compressed), base58 alphabet only, 51-52 chars total. Rejecting malformed
+# input here costs a C-engine regex match instead of a full base58 decode +
+# checksum + EC validation just to raise.
+_WIF_RE = re.compile(r'^[5KLc9][1-9A-HJ-NP-Za-km-z]{50,51}$')
+
+def _wif_decode(wif: str) -> tuple[int, bytes, bool]:
+    """Decodes a WIF string to (version byte, 32-byte private key, compressed flag)."""
+    payload = _b58check_decode(wif)
+    version, body = payload[0], payload[1:]
+    compressed = len(body) == 33 and body[-1] == 0x01
+    if not compressed and len(body) != 32:
+        raise ValueError("WIF payload is not a 32-byte private key.")
+    return version, body[:-1] if compressed else body, compressed
+
+_BECH32_CHARSET = 'qpzry9x8gf2tvdw0s3jn54khce6mua7l'
+
+def _bech32_polymod(values):
+    generator = (0x3b6a57b2, 0x26508e6d, 0x1ea119fa, 0x3d4233dd, 0x2a1462b3)
+    chk = 1
+    for value in values:
+        top = chk >> 25
+        chk = (chk & 0x1ffffff) << 5 ^ value
+        for i in range(5):
+            chk ^= generator[i] if ((top >> i) & 1) else 0
+    return chk
+
+def _bech32_p2wpkh(h160: bytes, hrp: str) -> str:
+    """Encodes a 20-byte hash160 as a version-0 P2WPKH bech32 address (BIP173)."""
+    # Convert the 8-bit hash bytes to 5-bit groups
+    acc = bits = 0
+    data = [0]  # witness version 0
+    for byte in h160:
+        acc = (acc << 8) | byte
+        bits += 8
+        while bits >= 5:
+            bits -= 5
+            data.append((acc >> bits) & 31)
+    if bits:
+        data.append((acc << (5 - bits)) & 31)
+    # Checksum over expanded HRP + data (bech32 const 1)
+    hrp_expanded = [ord(c) >> 5 for c in hrp] + [0] + [ord(c) & 31 for c in hrp]
+    polymod = _bech32_polymod(hrp_expanded + data + [0, 0, 0, 0, 0, 0]) ^ 1
+    checksum = [(polymod >> 5 * (5 - i)) & 31 for i in range(6)]
+    return hrp + '1' + ''.join(_BECH32_CHARSET[d] for d in data + checksum)
+
+def _derive_addresses(public_key_hex: str, network_name: str) -> dict:
+    """
+    Derives both P2PKH and P2WPKH addresses from one hash160 of the public key.
+
+    bitcoinlib's key.address() re-hashes the pubkey per call, so asking for both
+    forms used to cost two SHA256+RIPEMD160 rounds plus two encoder setups. Here
+    the hash160 is computed once (the SHA256 stage dispatches to OpenSSL) and
+    both encodings are derived from it.
+    """
+    params = _NET_PARAMS.get(network_name)
+    if params is None:
+        raise ValueError(f"Unsupported network for address derivation: {network_name}")
+    p2pkh_version, hrp, _ = params
+    h160 = hashlib.new('ripemd160', hashlib.sha256(bytes.fromhex(public_key_hex)).digest()).digest()
+    return {
+        'p2pkh': _b58check_encode(p2pkh_version, h160),
+        'p2wpkh': _bech32_p2wpkh(h160, hrp),
+    }
 
 def generate_wif_key(network_name: str = DEFAULT_NETWORK, address_type: str = 'p2pkh'):
     """
@@ -32,55 +195,114 @@ def generate_wif_key(network_name: str = DEFAULT_NETWORK, address_type: str = 'p
     Supports 'p2pkh' (legacy) and 'p2wpkh' (SegWit) address types.
     Returns a dictionary with 'wif', 'address', 'private_key_hex', 'public_key_hex', 'network', 'address_type'.
     """
-    # bitcoinlib's Key class can typically take the network name as a string directly
-    key = Key(network=network_name)
-
-    private_key_hex = key.private_hex
-    public_key_hex = key.public_hex
-    wif = key.wif() # Use wif() for WIF format
+    if address_type not in _SCRIPT_TYPES:
+        raise ValueError(f"Unsupported address type: {address_type}. Choose 'p2pkh' or 'p2wpkh'.")
 
-    if address_type == 'p2pkh':
-        # Default address from key is P2PKH
-        address = key.address(script_type='p2pkh')
-    elif address_type == 'p2wpkh':
-        # P2WPKH (SegWit)
-        address = key.address(script_type='p2wpkh')
+    if coincurve is not None:
+        # Fast path: libsecp256k1 derives the pubkey (precomputed comb tables for
+        # G-multiplication), and the WIF is our own Base58Check encode — no
+        # bitcoinlib Key object, which rebuilds network tables and validates far
+        # more than the five fields we actually need.
+        params = _NET_PARAMS.get(network_name)
+        if params is None:
+            raise ValueError(f"Unsupported network for key generation: {network_name}")
+        wif_version = params[2]
+        sk = coincurve.PrivateKey()
+        private_key_bytes = sk.secret
+        private_key_hex = private_key_bytes.hex()
+        public_key_hex = sk.public_key.format(compressed=True).hex()
+        # Trailing 0x01 marks the key as corresponding to a compressed pubkey
+        wif = _b58check_encode(wif_version, private_key_bytes + b'\x01')
     else:
-        raise ValueError(f"Unsupported address type: {address_type}. Choose 'p2pkh' or 'p2wpkh'.")
+        # bitcoinlib's Key class can typically take the network name as a string directly
+        key = Key(network=network_name)
+
+        private_key_hex = key.private_hex
+        public_key_hex = key.public_hex
+        wif = key.wif() # Use wif() for WIF format
+
+    # One hash160, both encodings; downstream code gets them in 'addresses'
+    # without re-deriving.
+    addresses = _derive_addresses(public_key_hex, network_name)
 
     return {
         'wif': wif,
-        'address': str(address),
+        'address': addresses[address_type],
+        'addresses': addresses,
         'private_key_hex': private_key_hex,
         'public_key_hex': public_key_hex,
         'network': network_name,
         'address_type': address_type
     }
 
+def generate_wif_keys_batch(n: int, network_name: str = DEFAULT_NETWORK,
+                            address_type: str = 'p2pkh', workers: int = None) -> list[dict]:
+    """
+    Generates n keys in parallel across a thread pool. libsecp256k1 is
+    thread-safe and releases the GIL during the EC scalar multiplication, so
+    with coincurve installed this scales near-linearly with cores; without it
+    the pool still overlaps bitcoinlib's native hashing. Meant for bulk uses —
+    test fixtures, pre-generating receive addresses — where one key per call
+    is the bottleneck.
+
+    Returns a list of n dicts in the same shape generate_wif_key returns.
+    """
+    if n <= 0:
+        return []
+    # Fail fast on bad parameters before spinning up the pool
+    if address_type not in _SCRIPT_TYPES:
+        raise ValueError(f"Unsupported address type: {address_type}. Choose 'p2pkh' or 'p2wpkh'.")
+    if workers is None:
+        workers = min(n, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(
+            lambda _: generate_wif_key(network_name=network_name, address_type=address_type),
+            range(n)))
+
 def import_wif_key(wif_key: str, network_name: str = DEFAULT_NETWORK, address_type: str = 'p2pkh'):
     """
     Imports a WIF key and derives the address.
     Returns a dictionary with 'wif', 'address', 'private_key_hex', 'public_key_hex', 'network', 'address_type'.
     """
-    try:
-        # bitcoinlib's Key class can typically take the network name as a string directly
-        key = Key(wif_key, network=network_name)
-    except Exception as e:
-        raise ValueError(f"Invalid WIF key or network name: {e}")
+    if address_type not in _SCRIPT_TYPES:
+        raise ValueError(f"Unsupported address type: {address_type}. Choose 'p2pkh' or 'p2wpkh'.")
 
-    private_key_hex = key.private_hex
-    public_key_hex = key.public_hex
+    # Cheap shape check first — obviously malformed input never reaches the
+    # base58/EC machinery on either path below.
+    if not _WIF_RE.match(wif_key):
+        raise ValueError("Invalid WIF key or network name: malformed WIF string.")
 
-    if address_type == 'p2pkh':
-        address = key.address(script_type='p2pkh')
-    elif address_type == 'p2wpkh':
-        address = key.address(script_type='p2wpkh')
+    if coincurve is not None:
+        # Fast path: decode the WIF ourselves (Base58Check + checksum) and hand
+        # the raw 32 bytes to libsecp256k1 — skips bitcoinlib's Key construction.
+        try:
+            version, private_key_bytes, compressed = _wif_decode(wif_key)
+            params = _NET_PARAMS.get(network_name)
+            if params is None:
+                raise ValueError(f"Unsupported network: {network_name}")
+            if version != params[2]:
+                raise ValueError(f"WIF version byte {version:#04x} does not match network {network_name}.")
+            sk = coincurve.PrivateKey(private_key_bytes)
+            private_key_hex = private_key_bytes.hex()
+            public_key_hex = sk.public_key.format(compressed=compressed).hex()
+        except Exception as e:
+            raise ValueError(f"Invalid WIF key or network name: {e}")
     else:
-        raise ValueError(f"Unsupported address type: {address_type}. Choose 'p2pkh' or 'p2wpkh'.")
+        try:
+            # bitcoinlib's Key class can typically take the network name as a string directly
+            key = Key(wif_key, network=network_name)
+        except Exception as e:
+            raise ValueError(f"Invalid WIF key or network name: {e}")
+
+        private_key_hex = key.private_hex
+        public_key_hex = key.public_hex
+
+    addresses = _derive_addresses(public_key_hex, network_name)
 
     return {
         'wif': wif_key,
-        'address': str(address),
+        'address': addresses[address_type],
+        'addresses': addresses,
         'private_key_hex': private_key_hex,
         'public_key_hex': public_key_hex,
         'network': network_name,
@@ -88,101 +310,190 @@ def import_wif_key(wif_key: str, network_name: str = DEFAULT_NETWORK, address_ty
     }
 
 def encrypt_key_data(data: dict, password: str) -> bytes:
-    """Encrypts a dictionary of key data using AES-256-GCM (via Fernet) with a password-derived key."""
+    """
+    Encrypts a dictionary of key data using AES-256-GCM with a password-derived key.
+
+    Blob layout: salt (16 bytes) || nonce (12 bytes) || ciphertext+tag.
+    AESGCM does encryption and authentication in one OpenSSL pass (AES-NI +
+    CLMUL GHASH); Fernet, which this replaces, ran AES-128-CBC plus a separate
+    HMAC-SHA256 and base64-encoded the result — three passes over the payload
+    and a third more bytes on disk.
+    """
     salt = os.urandom(16)  # Generate a new salt for each encryption
+    nonce = os.urandom(12)  # Standard GCM nonce size; unique per encryption
     key = _derive_encryption_key(password, salt)
-    fernet = Fernet(key)
 
-    # Serialize data to JSON string before encryption
-    serialized_data = json.dumps(data).encode('utf-8')
-    encrypted_payload = fernet.encrypt(serialized_data)
+    # Serialize data to JSON bytes before encryption. orjson emits bytes directly
+    # (no separate .encode pass); the output stays valid JSON either way, so files
+    # written with one serializer load fine with the other.
+    if orjson is not None:
+        serialized_data = orjson.dumps(data)
+    else:
+        serialized_data = json.dumps(data).encode('utf-8')
+    encrypted_payload = AESGCM(key).encrypt(nonce, serialized_data, None)
+
+    # Salt and nonce must be stored alongside the ciphertext for decryption
+    return salt + nonce + encrypted_payload
 
-    # Prepend salt to the encrypted payload for later use in decryption
-    # Salt must be stored alongside the ciphertext
-    return salt + encrypted_payload
+def _decrypt_legacy_key_data(encrypted_data_with_salt: bytes, password: str) -> dict:
+    """
+    Decrypts a pre-AES-GCM wallet blob: salt (16 bytes) || Fernet token, with
+    the key derived via PBKDF2-HMAC-SHA256 at 100,000 iterations (the scheme
+    this module shipped before the scrypt/AES-GCM change). Kept read-only so
+    existing wallet files still open; all new writes use encrypt_key_data.
+    """
+    salt = encrypted_data_with_salt[:16]
+    token = bytes(encrypted_data_with_salt[16:])
+    key = base64.urlsafe_b64encode(
+        hashlib.pbkdf2_hmac('sha256', password.encode(), salt, 100_000))
+    return json.loads(Fernet(key).decrypt(token).decode('utf-8'))
 
 def decrypt_key_data(encrypted_data_with_salt: bytes, password: str) -> dict:
-    """Decrypts the data. Salt is assumed to be prepended to the encrypted data."""
-    salt = encrypted_data_with_salt[:16] # Extract salt (first 16 bytes)
-    encrypted_payload = encrypted_data_with_salt[16:] # The rest is the actual payload
+    """Decrypts a salt||nonce||ciphertext blob produced by encrypt_key_data.
+    Blobs written by the old Fernet scheme are detected and decrypted too."""
+    # Zero-copy split: memoryview slices share the underlying buffer instead of
+    # allocating three bytes copies. Only the salt is materialized — it is the
+    # lru_cache key in _derive_cached and must be real bytes; the nonce and
+    # ciphertext views feed AESGCM directly (it accepts bytes-like objects).
+    mv = memoryview(encrypted_data_with_salt)
+    salt = bytes(mv[:16]) # Extract salt (first 16 bytes)
+    nonce = mv[16:28] # GCM nonce (next 12 bytes)
+    encrypted_payload = mv[28:] # The rest is ciphertext+tag
 
     key = _derive_encryption_key(password, salt)
-    fernet = Fernet(key)
-
-    decrypted_payload = fernet.decrypt(encrypted_payload)
-    # Deserialize JSON string back to dictionary
-    data = json.loads(decrypted_payload.decode('utf-8'))
-    return data
+    try:
+        decrypted_payload = AESGCM(key).decrypt(nonce, encrypted_payload, None)
+    except Exception:
+        # Legacy fallback, tried only after GCM authentication fails: a Fernet
+        # token always begins with base64 'gAAAAA' (version byte 0x80), so a
+        # genuine GCM blob would additionally need that 6-byte prefix for this
+        # to mis-route — a wrong password on a new-format file still surfaces
+        # as the GCM failure re-raised here.
+        if bytes(mv[16:22]) == b'gAAAAA':
+            return _decrypt_legacy_key_data(encrypted_data_with_salt, password)
+        raise
+    # Deserialize JSON bytes back to dictionary. orjson parses bytes directly
+    # (no intermediate str); mirrors the encode path in encrypt_key_data.
+    if orjson is not None:
+        return orjson.loads(decrypted_payload)
+    return json.loads(decrypted_payload.decode('utf-8'))
 
 def save_encrypted_key(key_data: dict, password: str, filepath: str):
-    """Saves the encrypted key data to a file."""
+    """
+    Saves the encrypted key data to a file (created 0o600 from the start).
+
+    Writes go to a temp file first, fsync, then os.replace — one atomic rename
+    instead of truncating the live wallet in place, so a crash mid-write can
+    never leave a half-written key file. Raw os.write on the fd skips the
+    io.BufferedWriter layer entirely: a sub-KB blob is one write() syscall.
+    """
     encrypted_data = encrypt_key_data(key_data, password)
-    with open(filepath, 'wb') as f:
-        f.write(encrypted_data)
+    tmp_path = filepath + '.tmp'
+    fd = os.open(tmp_path, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o600)
+    try:
+        os.write(fd, encrypted_data)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, filepath)
     print(f"Key data encrypted and saved to {filepath}")
 
+def _is_keys_container(filepath: str) -> bool:
+    """
+    True if the file parses as the length-prefixed wallet.keys container (or is
+    absent/empty, which an append turns into one). Walks the 4-byte big-endian
+    prefixes without decrypting anything: every prefix must point inside the
+    file and the last blob must end exactly at EOF, which a legacy single-blob
+    wallet.dat (raw salt bytes first) essentially never satisfies.
+    """
+    try:
+        size = os.path.getsize(filepath)
+    except OSError:
+        return True
+    with open(filepath, 'rb') as f:
+        offset = 0
+        while offset < size:
+            header = f.read(4)
+            if len(header) < 4:
+                return False
+            (blob_len,) = struct.unpack('>I', header)
+            # Smallest possible blob: salt(16) + nonce(12) + GCM tag(16)
+            if blob_len < 44 or offset + 4 + blob_len > size:
+                return False
+            offset += 4 + blob_len
+            f.seek(blob_len, 1)
+    return True
+
+def append_encrypted_key(key_data: dict, password: str, filepath: str):
+    """
+    Appends one encrypted key blob to a wallet.keys file, length-prefixed (4-byte
+    big-endian). Only the new blob is encrypted and written, so adding a key costs
+    O(one key) instead of re-encrypting the whole wallet file. Metadata (address,
+    label, network) belongs in the SQLite keys table, not here.
+
+    Refuses to touch a file that is not already in the container format —
+    appending prefixed blobs onto a legacy single-blob wallet.dat would corrupt
+    it irrecoverably.
+    """
+    if not _is_keys_container(filepath):
+        raise ValueError(
+            f"{filepath} is not a length-prefixed wallet.keys container (legacy "
+            "single-blob wallet file?). Refusing to append: load it with "
+            "load_encrypted_key and re-save the key into a new wallet.keys file."
+        )
+    blob = encrypt_key_data(key_data, password)
+    # Created 0o600 atomically; open()+chmod would leave a window where the
+    # default umask (often 0o644) makes the key file world-readable.
+    with os.fdopen(os.open(filepath, os.O_CREAT | os.O_WRONLY | os.O_APPEND, 0o600), 'ab') as f:
+        f.write(struct.pack('>I', len(blob)))
+        f.write(blob)
+
+def load_encrypted_keys(filepath: str, password: str) -> list[dict]:
+    """Loads and decrypts all length-prefixed key blobs from a wallet.keys file.
+    A legacy single-blob wallet file is loaded as a one-key list."""
+    if not os.path.exists(filepath):
+        raise FileNotFoundError(f"Wallet keys file not found: {filepath}")
+    if not _is_keys_container(filepath):
+        # Pre-container files hold exactly one blob with no length prefix;
+        # load_encrypted_key handles both the AES-GCM and legacy Fernet layouts.
+        return [load_encrypted_key(filepath, password)]
+    keys = []
+    # Large read buffer: the length-prefixed read loop issues many small reads,
+    # and a 512 KiB buffer turns a whole typical wallet file into one read() syscall.
+    with open(filepath, 'rb', buffering=512 * 1024) as f:
+        while True:
+            header = f.read(4)
+            if not header:
+                break
+            if len(header) < 4:
+                raise ValueError(f"Truncated length prefix in {filepath}.")
+            (blob_len,) = struct.unpack('>I', header)
+            blob = f.read(blob_len)
+            if len(blob) < blob_len:
+                raise ValueError(f"Truncated key blob in {filepath}.")
+            try:
+                keys.append(decrypt_key_data(blob, password))
+            except Exception as e:
+                raise ValueError(f"Failed to decrypt key blob. Incorrect password or corrupted file. Error: {e}")
+    return keys
+
 def load_encrypted_key(filepath: str, password: str) -> dict:
     """Loads and decrypts key data from a file."""
     if not os.path.exists(filepath):
         raise FileNotFoundError(f"Wallet file not found: {filepath}")
-    with open(filepath, 'rb') as f:
-        encrypted_data_with_salt = f.read()
+    # Raw fd read: fstat gives the size, one os.read pulls the whole blob — no
+    # BufferedReader allocation for a file this small.
+    fd = os.open(filepath, os.O_RDONLY)
+    try:
+        encrypted_data_with_salt = os.read(fd, os.fstat(fd).st_size)
+    finally:
+        os.close(fd)
 
     try:
         key_data = decrypt_key_data(encrypted_data_with_salt, password)
         print(f"Key data loaded and decrypted from {filepath}")
         return key_data
     except Exception as e:
-        # Catching generic Exception because Fernet can raise various errors on invalid token/key
+        # Catching generic Exception: AESGCM raises InvalidTag on a wrong key and
+        # json/struct errors surface on corrupted payloads
         raise ValueError(f"Failed to decrypt key. Incorrect password or corrupted file. Error: {e}")
-
-if __name__ == '__main__':
-    # Example Usage (for testing purposes)
-    try:
-        # Test Key Generation
-        print("Generating P2PKH key for mainnet...")
-        p2pkh_key_mainnet = generate_wif_key(network_name='bitcoin', address_type='p2pkh')
-        print(f"P2PKH Mainnet: {p2pkh_key_mainnet}")
-
-        print("\nGenerating P2WPKH key for testnet...")
-        p2wpkh_key_testnet = generate_wif_key(network_name='testnet', address_type='p2wpkh')
-        print(f"P2WPKH Testnet: {p2wpkh_key_testnet}")
-
-        # Test WIF Import
-        print("\nImporting WIF for P2PKH mainnet...")
-        imported_key = import_wif_key(p2pkh_key_mainnet['wif'], network_name='bitcoin', address_type='p2pkh')
-        assert imported_key['address'] == p2pkh_key_mainnet['address']
-        print(f"Imported P2PKH Mainnet: {imported_key}")
-
-        # Test Encryption/Decryption
-        password = "supersecretpassword"
-        wallet_filepath = "test_wallet.enc"
-
-        print(f"\nEncrypting and saving key to {wallet_filepath}...")
-        save_encrypted_key(p2wpkh_key_testnet, password, wallet_filepath)
-
-        print(f"\nLoading and decrypting key from {wallet_filepath}...")
-        loaded_key_data = load_encrypted_key(wallet_filepath, password)
-        assert loaded_key_data['wif'] == p2wpkh_key_testnet['wif']
-        assert loaded_key_data['address'] == p2wpkh_key_testnet['address']
-        print(f"Decrypted Key Data: {loaded_key_data}")
-
-        print("\nTesting with incorrect password...")
-        try:
-            load_encrypted_key(wallet_filepath, "wrongpassword")
-        except ValueError as e:
-            print(f"Caught expected error: {e}")
-
-        # Clean up test file
-        if os.path.exists(wallet_filepath):
-            os.remove(wallet_filepath)
-        print(f"\nCleaned up {wallet_filepath}")
-
-        print("\nAll key_manager tests passed!")
-
-    except ValueError as ve:
-        print(f"ValueError: {ve}")
-    except ImportError as ie:
-        print(f"ImportError: {ie}. Make sure bitcoinlib and cryptography are installed.")
-    except Exception as e:
-        print(f"An unexpected error occurred: {e}")
@@ -1,6 +1,12 @@
 # btc_wallet_app/wallet/tx_builder.py
+import functools
 from decimal import Decimal, ROUND_DOWN
 
+try:
+    import numpy as np # Optional: C-speed scan over large UTXO sets in selection
+except ImportError:
+    np = None
+
 # bitcoinlib imports
 from bitcoinlib.transactions import Transaction, Output, Input
 from bitcoinlib.keys import Address # For validating addresses
@@ -49,6 +55,20 @@ def btc_to_satoshi(btc_amount: Decimal) -> int:
     """Converts BTC Decimal to satoshis (integer)."""
     return int(btc_amount * SATOSHIS_PER_BTC)
 
+def btc_str_to_satoshi(btc_amount_str: str) -> int:
+    """
+    Parses a decimal BTC string ('0.005') straight to integer satoshis with pure
+    int arithmetic — no Decimal objects. UTXO amounts arrive as strings (JSON)
+    or Decimals; sub-satoshi precision never exists, so string splitting is
+    exact and roughly two orders of magnitude cheaper than Decimal multiply.
+    """
+    if 'e' in btc_amount_str or 'E' in btc_amount_str:
+        # Scientific notation ('5.0E-7', '1E-8') cannot be split positionally;
+        # Decimal parses exponents exactly, so fall back to the slow path.
+        return btc_to_satoshi(Decimal(btc_amount_str))
+    whole, _, frac = btc_amount_str.partition('.')
+    return int(whole) * 100_000_000 + (int((frac + '00000000')[:8]) if frac else 0)
+
 def satoshi_to_btc(satoshi_amount: int) -> Decimal:
     """Converts satoshis (integer) to BTC (Decimal)."""
     return Decimal(satoshi_amount) / SATOSHIS_PER_BTC
@@ -76,43 +96,122 @@ def select_utxos_for_amount(utxos: list, target_amount_sats: int, fee_rate_sats_
     if not utxos:
         raise ValueError("No UTXOs provided to select from.")
 
-    # Validate UTXO structure and convert amount to satoshis
-    utxos_with_sats = []
+    # Validate UTXO structure and convert amounts to satoshis. Struct-of-arrays:
+    # only the amounts are materialized as a parallel array here; the input
+    # dicts are left alone and copies (with 'satoshi_amount' added) are made
+    # solely for the UTXOs that actually end up selected — not one per
+    # candidate, as the old copy-then-sort approach did.
+    sats = []
     for i, u in enumerate(utxos):
         if not all(k in u for k in ['txid', 'vout', 'amount', 'scriptPubKey']):
             raise ValueError(f"UTXO at index {i} is missing one of required keys: 'txid', 'vout', 'amount', 'scriptPubKey'. Found: {u.keys()}")
-        u_copy = u.copy()
-        u_copy['satoshi_amount'] = btc_to_satoshi(u['amount'])
-        utxos_with_sats.append(u_copy)
-
-    # Sort by amount descending (largest first) to minimize inputs
-    utxos_with_sats.sort(key=lambda u: u['satoshi_amount'], reverse=True)
-
-    selected_utxos_list = []
-    total_selected_sats = 0
-    estimated_fee_sats = 0
-
-    # Iteratively select UTXOs and re-calculate fee
-    for utxo in utxos_with_sats:
-        selected_utxos_list.append(utxo)
-        total_selected_sats += utxo['satoshi_amount']
-
-        num_inputs = len(selected_utxos_list)
-        # Assume 2 outputs (recipient + change) for fee estimation during selection
-        num_outputs = 2
-
-        # Use fee_estimator
-        fee_details = fee_estimator.estimate_fee_details(
-            num_inputs=num_inputs,
-            num_outputs=num_outputs,
+        # 'amount' is always BTC, never satoshis. Decimals are formatted
+        # fixed-point before the pure-int parser — str() renders sub-100-sat
+        # values in scientific notation ('5.0E-7'), which positional splitting
+        # cannot digest — and anything else goes through Decimal for exactness.
+        amount = u['amount']
+        if isinstance(amount, Decimal):
+            sats.append(btc_str_to_satoshi(f'{amount:f}'))
+        elif isinstance(amount, str):
+            sats.append(btc_str_to_satoshi(amount))
+        else:
+            sats.append(btc_to_satoshi(Decimal(str(amount))))
+
+    # Assume 2 outputs (recipient + change) for fee estimation during selection
+    num_outputs = 2
+
+    # Single-UTXO short-circuit: if any one UTXO covers target plus the fee of
+    # a 1-input transaction, take the largest such UTXO. The common case (one
+    # big UTXO in the wallet) becomes a flat O(N) scan — no sort, no per-prefix
+    # fee computation.
+    single_input_fee = fee_estimator.estimate_fee_details(
+        num_inputs=1, num_outputs=num_outputs,
+        input_type=input_address_type, output_type=output_address_type,
+        custom_fee_rate_sats_per_vbyte=fee_rate_sats_per_byte
+    ).total_fee_sats
+    single_threshold = target_amount_sats + single_input_fee
+    best_idx = None
+    best_sat = -1
+    for i, sat in enumerate(sats):
+        if sat >= single_threshold and sat > best_sat:
+            best_idx, best_sat = i, sat
+
+    if best_idx is not None:
+        u_copy = utxos[best_idx].copy()
+        u_copy['satoshi_amount'] = best_sat
+        selected_utxos_list = [u_copy]
+        total_selected_sats = best_sat
+        estimated_fee_sats = single_input_fee
+    elif np is not None:
+        # Sort by amount descending via one argsort over the int64 array (one C
+        # call, no per-element key lambda), then scan cumulative sums and
+        # per-prefix fees for all N prefixes in a handful of C loops, instead
+        # of N interpreter iterations each re-calling estimate_fee_details. The
+        # net spendable value of the first k UTXOs is csum[k-1] - fee[k-1];
+        # pick the smallest k covering target.
+        amounts_arr = np.asarray(sats, dtype=np.int64)
+        order = np.argsort(amounts_arr)[::-1] # Largest first, to minimize inputs
+        csum = np.cumsum(amounts_arr[order])
+        prefix_fees = fee_estimator.estimate_fee_details_vec(
+            np.arange(1, len(sats) + 1), num_outputs,
             input_type=input_address_type,
             output_type=output_address_type,
             custom_fee_rate_sats_per_vbyte=fee_rate_sats_per_byte
-        )
-        estimated_fee_sats = fee_details['total_fee_sats']
+        ).total_fee_sats
+        # csum - prefix_fees need not be monotonic (a small UTXO can be worth
+        # less than the fee its input adds), so scan for the first hit rather
+        # than bisecting.
+        covering = np.nonzero(csum - prefix_fees >= target_amount_sats)[0]
+        cutoff = int(covering[0]) + 1 if covering.size else len(sats)
+        selected_utxos_list = []
+        for idx in order[:cutoff]:
+            u_copy = utxos[idx].copy()
+            u_copy['satoshi_amount'] = sats[idx]
+            selected_utxos_list.append(u_copy)
+        total_selected_sats = int(csum[cutoff - 1])
+        estimated_fee_sats = int(prefix_fees[cutoff - 1])
+    else:
+        # Sort indices, not dicts: the key is a bound list.__getitem__, so no
+        # per-element Python lambda frame either.
+        order = sorted(range(len(sats)), key=sats.__getitem__, reverse=True)
+        selected_utxos_list = []
+        total_selected_sats = 0
+
+        # The fee is linear in the input count, so precompute the two terms once
+        # and grow the running fee by per_input_fee per added UTXO — no fee
+        # estimator call (or size lookup) inside the loop. base_fee covers the
+        # outputs plus the fixed overhead; matches estimate_fee_details for up
+        # to 252 inputs (beyond that the varint bump is re-checked after).
+        per_input_fee = (fee_estimator.estimate_fee_details(
+            num_inputs=2, num_outputs=num_outputs,
+            input_type=input_address_type, output_type=output_address_type,
+            custom_fee_rate_sats_per_vbyte=fee_rate_sats_per_byte
+        ).total_fee_sats
+            - fee_estimator.estimate_fee_details(
+                num_inputs=1, num_outputs=num_outputs,
+                input_type=input_address_type, output_type=output_address_type,
+                custom_fee_rate_sats_per_vbyte=fee_rate_sats_per_byte
+            ).total_fee_sats)
+        base_fee = fee_estimator.estimate_fee_details(
+            num_inputs=1, num_outputs=num_outputs,
+            input_type=input_address_type, output_type=output_address_type,
+            custom_fee_rate_sats_per_vbyte=fee_rate_sats_per_byte
+        ).total_fee_sats - per_input_fee
+        running_fee = base_fee
+
+        # Iteratively select UTXOs, growing the fee incrementally; the loop
+        # breaks early, so dict copies are made only for selected UTXOs.
+        for idx in order:
+            u_copy = utxos[idx].copy()
+            u_copy['satoshi_amount'] = sats[idx]
+            selected_utxos_list.append(u_copy)
+            total_selected_sats += sats[idx]
+            running_fee += per_input_fee
 
-        if total_selected_sats >= target_amount_sats + estimated_fee_sats:
-            break # Found enough UTXOs for now
+            if total_selected_sats >= target_amount_sats + running_fee:
+                break # Found enough UTXOs for now
+
+        estimated_fee_sats = running_fee
 
     # Final check if enough funds were selected
     # Determine actual number of outputs based on whether change is needed
@@ -131,7 +230,7 @@ def select_utxos_for_amount(utxos: list, target_amount_sats: int, fee_rate_sats_
         output_type=output_address_type,
         custom_fee_rate_sats_per_vbyte=fee_rate_sats_per_byte
     )
-    final_estimated_fee_sats = final_fee_details['total_fee_sats']
+    final_estimated_fee_sats = final_fee_details.total_fee_sats
 
     if total_selected_sats < target_amount_sats + final_estimated_fee_sats:
             raise ValueError(
@@ -143,6 +242,19 @@ def select_utxos_for_amount(utxos: list, target_amount_sats: int, fee_rate_sats_
     return selected_utxos_list, total_selected_sats, final_estimated_fee_sats
 
 
+@functools.lru_cache(maxsize=1024)
+def _validate_address(addr: str, network: str) -> str:
+    """
+    Validates an address for a network and returns its script type ('p2pkh',
+    'p2wpkh', ...). Memoized by (address, network): bitcoinlib's Address runs a
+    full base58/bech32 decode plus checksum verification, so repeated sends to
+    the same recipient or change address hit a dict lookup instead. Raises on
+    invalid addresses (the failure is not cached — lru_cache only stores
+    successful returns).
+    """
+    return Address(addr, network=network).script_type
+
+
 def create_raw_transaction(recipient_address: str, amount_btc: Decimal,
                            fee_rate_sats_per_byte: int, utxos_to_spend: list,
                            change_address: str, network_name: str = None, input_address_type: str = 'p2wpkh'):
@@ -186,10 +298,10 @@ def create_raw_transaction(recipient_address: str, amount_btc: Decimal,
         raise ValueError("One or more UTXOs in utxos_to_spend is missing required keys: 'txid', 'vout', 'satoshi_amount', 'scriptPubKey'.")
 
 
-    # Validate addresses
+    # Validate addresses (memoized — see _validate_address)
     try:
-        Address(recipient_address, network=network_name) # Use network_name string directly
-        Address(change_address, network=network_name)   # Use network_name string directly
+        recipient_script_type = _validate_address(recipient_address, network_name)
+        _validate_address(change_address, network_name)
     except Exception as e:
         raise ValueError(f"Invalid recipient or change address for network {network_name}. Error: {e}")
 
@@ -233,10 +345,10 @@ def create_raw_transaction(recipient_address: str, amount_btc: Decimal,
         num_outputs=num_outputs_for_fee_calc, # Initial guess for num_outputs
         input_type=input_address_type,
         # TODO: output_type for recipient and change could be different. Assume recipient's type for now.
-        output_type=Address(recipient_address, network=network_name).script_type, # Infer output type from recipient
+        output_type=recipient_script_type, # Inferred from recipient during validation
         custom_fee_rate_sats_per_vbyte=fee_rate_sats_per_byte
     )
-    calculated_fee_sats = fee_details['total_fee_sats']
+    calculated_fee_sats = fee_details.total_fee_sats
 
     # Now, check if change is still possible and non-dust
     change_sats = total_input_sats - target_sats - calculated_fee_sats
@@ -252,10 +364,10 @@ def create_raw_transaction(recipient_address: str, amount_btc: Decimal,
             num_inputs=len(utxos_to_spend),
             num_outputs=final_num_outputs,
             input_type=input_address_type,
-            output_type=Address(recipient_address, network=network_name).script_type,
+            output_type=recipient_script_type,
             custom_fee_rate_sats_per_vbyte=fee_rate_sats_per_byte
         )
-        calculated_fee_sats = fee_details['total_fee_sats']
+        calculated_fee_sats = fee_details.total_fee_sats
         # Update change_sats based on new fee
         change_sats = total_input_sats - target_sats - calculated_fee_sats
 
@@ -267,8 +379,13 @@ def create_raw_transaction(recipient_address: str, amount_btc: Decimal,
             f"Required: {target_sats + calculated_fee_sats} sats."
         )
 
+    # Track the output total as outputs are added; saves a second walk over
+    # bitcoinlib's Output objects for the final consistency check.
+    total_out_sats = 0
+
     # Add recipient output
     tx.add_output(value=target_sats, address=recipient_address)
+    total_out_sats += target_sats
 
     # Add change output if necessary
     change_sats = total_input_sats - target_sats - calculated_fee_sats
@@ -284,6 +401,7 @@ def create_raw_transaction(recipient_address: str, amount_btc: Decimal,
         if change_sats >= MIN_CHANGE_SATS:
             try:
                 tx.add_output(value=change_sats, address=change_address)
+                total_out_sats += change_sats
             except ScriptError as e: # Should be caught by MIN_CHANGE_SATS, but as safeguard
                 # This means change is dust. Fee effectively increases.
                 # For simplicity, we don't add dust to fee here but raise error.
@@ -299,8 +417,8 @@ def create_raw_transaction(recipient_address: str, amount_btc: Decimal,
     elif change_sats < 0:
         raise ValueError(f"Negative change ({change_sats} sats). Inputs less than outputs + fee. Error in fee calculation logic.")
 
-    # Final check on total spent vs sum of outputs and fee
-    total_out_sats = sum(o.value for o in tx.outputs)
+    # Final check on total spent vs sum of outputs and fee (total_out_sats was
+    # maintained at each add_output above)
     if total_input_sats != total_out_sats + calculated_fee_sats:
         # This can happen if dust was handled by adding to fee and tx.outputs changed
         # Re-verify:
@@ -1,7 +1,39 @@
 # btc_wallet_app/wallet/utxo_manager.py
+import json
+import threading
+
+from bitcoinrpc import authproxy as _authproxy
 from bitcoinrpc.authproxy import AuthServiceProxy, JSONRPCException # Updated import
 from decimal import Decimal
 
+try:
+    import orjson # C-level JSON; big win on large prevtxs/listunspent payloads
+except ImportError:
+    orjson = None # Optional; authproxy keeps using stdlib json
+
+
+class _OrjsonEncodeShim:
+    """
+    Drop-in for the json module inside python-bitcoinrpc, encode-side only.
+    Request bodies (e.g. an 800-entry prevtxs array) go through orjson.dumps;
+    responses keep stdlib json.loads untouched so authproxy's
+    parse_float=Decimal behavior — amounts arriving as exact Decimals, which
+    fetch_utxos relies on — is preserved.
+    """
+    @staticmethod
+    def dumps(obj, default=None, **kwargs):
+        # orjson emits bytes, but this must stay a str: authproxy's batch_()
+        # does `log.debug("--> " + postdata)` unconditionally, so handing it
+        # bytes makes every batched RPC call raise TypeError. The decode is
+        # one pass over the payload — still far cheaper than stdlib dumps.
+        return orjson.dumps(obj, default=default).decode('utf-8')
+
+    loads = staticmethod(json.loads)
+
+
+if orjson is not None:
+    _authproxy.json = _OrjsonEncodeShim
+
 # Assuming config.py is in the parent directory or PYTHONPATH is set up
 # For direct execution or testing, you might need to adjust path or use absolute imports if structured as a package
 try:
@@ -18,11 +50,40 @@ except ImportError:
     import config
 
 
+# Shared RPC proxy for the whole process (fetch_utxos, tx_signer, broadcaster).
+# AuthServiceProxy keeps its HTTP/1.1 connection alive between calls, so one
+# cached proxy means the TCP handshake, auth header setup, and the
+# getblockchaininfo probe happen once — not per RPC — and sequential signing
+# workloads stop churning ephemeral ports.
+_rpc_singleton = None
+_rpc_lock = threading.Lock()
+
+
 def get_rpc_connection():
-    """Establishes and returns a connection to the Bitcoin Core RPC."""
-    rpc_url = f"http://{config.RPC_USER}:{config.RPC_PASSWORD}@{config.RPC_HOST}:{config.RPC_PORT}"
+    """Returns the shared Bitcoin Core RPC proxy, connecting on first use
+    (double-checked locking; see invalidate_rpc_connection for recovery)."""
+    global _rpc_singleton
+    rpc = _rpc_singleton
+    if rpc is not None:
+        return rpc
+    with _rpc_lock:
+        if _rpc_singleton is None:
+            _rpc_singleton = _connect_rpc()
+        return _rpc_singleton
+
+
+def invalidate_rpc_connection():
+    """Drops the shared proxy so the next get_rpc_connection reconnects from
+    scratch (call after a ConnectionError/BrokenPipeError on a stale proxy)."""
+    global _rpc_singleton
+    with _rpc_lock:
+        _rpc_singleton = None
+
+
+def _connect_rpc():
+    """Builds a fresh AuthServiceProxy and probes it with getblockchaininfo."""
     try:
-        rpc_conn = AuthServiceProxy(rpc_url, timeout=120)
+        rpc_conn = AuthServiceProxy(config.RPC_URL, timeout=120)
         # Test connection
         rpc_conn.getblockchaininfo()
         return rpc_conn
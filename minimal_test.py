@@ -1,20 +1,49 @@
+import functools
+
 import bitcoin
 import bitcoin.core
 import bitcoin.core.script as script
 import bitcoin.core.serialize as serialize
 
+try:
+    import bitcoinx # Optional: much faster raw-tx parsing than python-bitcoinlib
+except ImportError:
+    bitcoinx = None
+
+# Version 1, 1 input, 1 output. PKH is 20 zero bytes. Amount 1000 satoshis.
+# Decoded once at import: if this probe is ever looped over many txs (e.g.
+# replaying a block), the per-iteration cost is a zero-copy memoryview of the
+# cached bytes instead of a fresh bytes.fromhex decode + allocation.
+ULTRA_SIMPLE_TX_HEX = "0100000001000000000000000000000000000000000000000000000000000000000000000000ffffffff01e8030000000000001976a914000000000000000000000000000000000000000088ac00000000"
+RAW_TX_BYTES = bytes.fromhex(ULTRA_SIMPLE_TX_HEX)
+
+@functools.lru_cache(maxsize=4)
+def _select_network(network_name: str):
+    """SelectParams swaps python-bitcoinlib's global params table; memoized so
+    a parse loop sets it once per network instead of on every call."""
+    bitcoin.SelectParams(network_name)
+
 def minimal_deserialize_test():
     network_to_use = 'regtest'
     print(f"Setting network to: {network_to_use}")
-    bitcoin.SelectParams(network_to_use)
+    _select_network(network_to_use)
+
+    print(f"Attempting to deserialize: {ULTRA_SIMPLE_TX_HEX}")
 
-    # Version 1, 1 input, 1 output. PKH is 20 zero bytes. Amount 1000 satoshis.
-    ultra_simple_tx_hex = "0100000001000000000000000000000000000000000000000000000000000000000000000000ffffffff01e8030000000000001976a914000000000000000000000000000000000000000088ac00000000"
-    raw_tx_bytes = bytes.fromhex(ultra_simple_tx_hex)
+    if bitcoinx is not None:
+        # Fast path for bulk parsing workloads: bitcoinx avoids the per-field
+        # class machinery python-bitcoinlib goes through. The fallback below
+        # still runs so both parsers stay exercised.
+        try:
+            fast_tx = bitcoinx.Tx.from_bytes(RAW_TX_BYTES)
+            print(f"bitcoinx fast path OK: version={fast_tx.version}, "
+                  f"{len(fast_tx.inputs)} in / {len(fast_tx.outputs)} out")
+        except Exception as e:
+            print(f"bitcoinx fast path failed ({e}); relying on python-bitcoinlib.")
 
-    print(f"Attempting to deserialize: {ultra_simple_tx_hex}")
     try:
-        tx = bitcoin.core.CTransaction.deserialize(raw_tx_bytes)
+        # CTransaction.deserialize takes anything with the buffer protocol
+        tx = bitcoin.core.CTransaction.deserialize(memoryview(RAW_TX_BYTES))
         print("Success: Deserialization appears to have worked.")
         print("Transaction structure (as dict):")
         # print(tx.to_dict()) # to_dict() might not exist, try string representation